@@ -2,10 +2,19 @@
 import argparse
 import json
 import os
+import shutil
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any, List
 
+from file_utils import write_bytes_atomic
+
+try:
+    import orjson
+except ImportError:  # optional; falls back to the stdlib json module
+    orjson = None
+
 NEW_FLAGS = [
     'ai_subject',
     'ai_verse',
@@ -21,25 +30,40 @@ def find_json_files(paths: List[str]) -> List[str]:
         paths = ['.']
     for p in paths:
         if os.path.isdir(p):
-            for root, _, names in os.walk(p):
-                for n in names:
-                    if n.endswith('.json'):
-                        files.append(os.path.join(root, n))
+            # Iterative scandir walk; DirEntry caches the type from getdents
+            stack = [p]
+            while stack:
+                d = stack.pop()
+                try:
+                    it = os.scandir(d)
+                except OSError:
+                    continue
+                with it:
+                    for e in it:
+                        if e.is_dir():
+                            if not e.is_symlink():
+                                stack.append(e.path)
+                        elif e.name.endswith('.json'):
+                            files.append(e.path)
         else:
             if p.endswith('.json') and os.path.isfile(p):
                 files.append(p)
     return sorted(files)
 
 
+_MISSING = object()
+
+
 def add_flags_to_record(obj: dict) -> bool:
     changed = False
     for k in NEW_FLAGS:
-        if k not in obj:
+        prev = obj.get(k, _MISSING)
+        if prev is _MISSING:
             obj[k] = False
             changed = True
-        elif not isinstance(obj[k], bool):
+        elif not isinstance(prev, bool):
             # Coerce to bool if already present but not boolean
-            obj[k] = bool(obj[k])
+            obj[k] = bool(prev)
             changed = True
     return changed
 
@@ -65,15 +89,19 @@ def add_flags_to_doc(doc: Any) -> bool:
 def backup_file(path: str) -> str:
     ts = time.strftime('%Y%m%d-%H%M%S')
     backup = f'{path}.bak.{ts}'
-    with open(path, 'rb') as src, open(backup, 'wb') as dst:
-        dst.write(src.read())
+    # copyfile streams in-kernel (sendfile) instead of buffering the whole file
+    shutil.copyfile(path, backup)
     return backup
 
 
 def process_file(path: str, dry_run: bool = False, no_backup: bool = False) -> str:
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            doc = json.load(f)
+        if orjson:
+            with open(path, 'rb') as f:
+                doc = orjson.loads(f.read())
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                doc = json.load(f)
     except Exception as e:
         return f'[ERROR] Read failed {path}: {e}'
 
@@ -90,14 +118,31 @@ def process_file(path: str, dry_run: bool = False, no_backup: bool = False) -> s
     try:
         if not no_backup:
             backup_file(path)
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(doc, f, ensure_ascii=False, indent=2)
-            f.write('\n')
+        # Serialize fully, write once to a temp file, then swap it in atomically
+        if orjson:
+            payload = orjson.dumps(doc, option=orjson.OPT_INDENT_2) + b'\n'
+        else:
+            payload = (json.dumps(doc, ensure_ascii=False, indent=2) + '\n').encode('utf-8')
+        write_bytes_atomic(path, payload)
         return f'[OK] Updated: {path}'
     except Exception as e:
         return f'[ERROR] Write failed {path}: {e}'
 
 
+def process_files(files: List[str], dry_run: bool, no_backup: bool, workers: int):
+    """
+    Yield process_file messages in file order, using a process pool when
+    there is more than one file and more than one worker.
+    """
+    if workers <= 1 or len(files) < 2:
+        for fp in files:
+            yield process_file(fp, dry_run=dry_run, no_backup=no_backup)
+        return
+    n = len(files)
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        yield from ex.map(process_file, files, [dry_run] * n, [no_backup] * n, chunksize=4)
+
+
 def main():
     ap = argparse.ArgumentParser(
         description='Add ai_* boolean flags (False) to every record in JSON files with top-level arrays.'
@@ -109,6 +154,12 @@ def main():
         action='store_true',
         help='Do not create .bak timestamped backups',
     )
+    ap.add_argument(
+        '--workers',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Worker processes (default: CPU count; 1 disables the pool)',
+    )
     args = ap.parse_args()
 
     files = find_json_files(args.paths)
@@ -116,8 +167,8 @@ def main():
         print('[INFO] No JSON files found.', file=sys.stderr)
         sys.exit(1)
 
-    for fp in files:
-        print(process_file(fp, dry_run=args.dry_run, no_backup=args.no_backup))
+    for msg in process_files(files, args.dry_run, args.no_backup, args.workers):
+        print(msg)
 
 
 if __name__ == '__main__':
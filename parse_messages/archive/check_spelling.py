@@ -1,13 +1,22 @@
 #!/usr/bin/env python3
+import atexit
 import json
 import os
 import re
+import shelve
 import sys
 import shutil
 import difflib
 import unicodedata
+from bisect import bisect_right
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
 
+try:
+    import orjson
+except ImportError:  # optional; falls back to the stdlib json module
+    orjson = None
+
 # Fields to process (override with --fields)
 DEFAULT_FIELDS = ['subject', 'verse', 'reflection', 'prayer', 'reading']
 
@@ -39,10 +48,35 @@ CUSTOM_WORDS = set()
 GLOBAL_ALLOWLIST_FILE = 'allowlist_global.txt'
 FIELD_ALLOWLIST_FILE_TEMPLATE = 'allowlist_{field}.txt'
 
-PAREN_RE = re.compile(r'\([^()]*\)')
-WORD_RE = re.compile(r"[A-Za-z][A-Za-z'\-]*")
+# Possessive tail (3.11+): a token never gives characters back, so no backtracking
+WORD_RE = re.compile(r"[A-Za-z][A-Za-z'\-]*+")
+PAREN_CHAR_RE = re.compile(r'[()]')
 SEPARATOR = '=' * 72
 
+# Persistent check/suggest cache, under the user cache dir unless --spell-cache says otherwise
+SPELL_CACHE_FILE = os.path.join('daily_devotional', 'spellcache')
+# Shelf key holding the dictionary fingerprint the cached results were computed with
+SPELL_CACHE_FINGERPRINT_KEY = '__dict_fingerprint__'
+# Where enchant's providers look for <tag>.dic/.aff word lists, plus enchant's
+# personal word list directory (its <tag>.dic/.exc are merged into every Dict)
+DICT_SEARCH_DIRS = (
+    os.environ.get('DICPATH', ''),
+    os.environ.get('ENCHANT_CONFIG_DIR', ''),
+    os.path.expanduser('~/.config/enchant'),
+    os.path.expanduser('~/.config/enchant/hunspell'),
+    os.path.expanduser('~/.local/share/enchant/hunspell'),
+    os.path.expanduser('~/Library/Spelling'),
+    '/usr/share/hunspell',
+    '/usr/share/myspell',
+    '/usr/share/myspell/dicts',
+    '/usr/local/share/hunspell',
+    '/opt/homebrew/share/hunspell',
+    '/Library/Spelling',
+)
+
+# Tokens the speller accepted this run; lets whole fields skip the per-token checks
+_known_good: set = set()
+
 # Glue characters that may appear after a word
 DASH_CHARS = r'\-–—‒―−‑'  # includes NB hyphen U+2011 (‑)
 SOFT_HYPHEN = '\u00ad'
@@ -68,19 +102,55 @@ SOFT_HYPHEN_CH = '\u00ad'
 
 def read_json_file(path: str) -> Optional[Tuple[object, str]]:
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        return json.loads(content), content
+        with open(path, 'rb') as f:
+            raw = f.read()
+        content = raw.decode('utf-8')
+        data = orjson.loads(raw) if orjson else json.loads(content)
+        return data, content
     except Exception:
         return None
 
 
 def write_json_file(path: str, data) -> None:
+    if orjson:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2) + b'\n')
+        return
     text = json.dumps(data, ensure_ascii=False, indent=2)
     with open(path, 'w', encoding='utf-8') as f:
         f.write(text + '\n')
 
 
+def list_json_files(base_dir: str) -> List[Tuple[str, str]]:
+    """Sorted (name, path) pairs for the .json files directly in base_dir."""
+    with os.scandir(base_dir) as it:
+        return sorted((e.name, e.path) for e in it if e.name.endswith('.json') and e.is_file())
+
+
+@lru_cache(maxsize=64)
+def _load_json_cached(path: str, mtime_ns: int) -> Optional[Tuple[object, str]]:
+    return read_json_file(path)
+
+
+def load_json_cached(path: str) -> Optional[Tuple[object, str]]:
+    """
+    Per-run parse cache keyed by (path, mtime_ns). Scanning and applying share
+    the same parsed object, so apply functions mutate it in place and each
+    touched file is written once at the end.
+    """
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    return _load_json_cached(path, mtime_ns)
+
+
+def write_touched_files(touched: Dict[str, object]) -> None:
+    for path, data in touched.items():
+        shutil.copy2(path, path + '.bak')
+        write_json_file(path, data)
+
+
 def load_allowlist_file(path: str) -> set:
     items = set()
     if not os.path.isfile(path):
@@ -111,30 +181,144 @@ def build_allowlists() -> Tuple[set, Dict[str, set], set]:
     return global_lower, field_lower_map, custom_lower
 
 
+def split_paren_segments(text: str) -> List[Tuple[bool, str]]:
+    """
+    Split text into (inside_parens, segment) pieces in a single walk. Only
+    balanced pairs count as parentheticals; an unmatched '(' or ')' stays in
+    the outside text. Shared by scanning and applying so both agree on what
+    is "inside parentheses".
+
+    A balanced pair that follows an unmatched '(' is still inside, e.g. the
+    "(c)" in "a (b (c) d". The apply path used to treat everything after an
+    unmatched '(' as outside and rewrote words in such a pair, although the
+    scan had never flagged them; now outside-only fixes leave it alone.
+    """
+    stack: List[int] = []
+    spans: List[Tuple[int, int]] = []
+    # Jump straight between paren characters instead of walking every char
+    for m in PAREN_CHAR_RE.finditer(text):
+        i = m.start()
+        if m.group() == '(':
+            stack.append(i)
+        elif stack:
+            start = stack.pop()
+            # An enclosing pair absorbs the spans nested inside it
+            while spans and spans[-1][0] > start:
+                spans.pop()
+            spans.append((start, i + 1))
+    segments: List[Tuple[bool, str]] = []
+    last = 0
+    for start, end in spans:
+        segments.append((False, text[last:start]))
+        segments.append((True, text[start:end]))
+        last = end
+    segments.append((False, text[last:]))
+    return segments
+
+
 def remove_parentheticals(text: str) -> str:
-    prev = None
-    curr = text
-    while prev != curr:
-        prev = curr
-        curr = PAREN_RE.sub('', curr)
-    return curr
+    if '(' not in text:
+        return text
+    return ''.join(seg for inside, seg in split_paren_segments(text) if not inside)
 
 
 def tokenize_words(text: str):
-    return list(WORD_RE.finditer(text))
+    return WORD_RE.finditer(text)
+
+
+@lru_cache(maxsize=65536)
+def word_case(word: str) -> str:
+    """Classify a token's casing once; distinct tokens repeat heavily."""
+    if word.islower():
+        return 'lower'
+    if word.isupper():
+        return 'upper'
+    if word.istitle():
+        return 'title'
+    return 'mixed'
 
 
 def preserve_case(original: str, suggestion: str) -> str:
-    if original.islower():
+    case = word_case(original)
+    if case == 'lower':
         return suggestion.lower()
-    if original.isupper():
+    if case == 'upper':
         return suggestion.upper()
-    if original.istitle():
+    if case == 'title':
         return suggestion.title()
     return suggestion
 
 
-def init_speller():
+def default_spell_cache_path() -> str:
+    return os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), SPELL_CACHE_FILE)
+
+
+def dict_fingerprint(speller) -> str:
+    """
+    Identify the dictionary behind speller: tag, provider, enchant version and
+    the size/mtime of every word list file for the tag (installed dictionary
+    and personal word list). Any change gives a different fingerprint.
+    """
+    provider = getattr(speller, 'provider', None)
+    parts = [speller.tag, getattr(provider, 'name', ''), getattr(provider, 'file', '')]
+    try:
+        import enchant as enchant_mod
+
+        parts.append(enchant_mod.get_enchant_version())
+    except Exception:
+        pass
+    for d in DICT_SEARCH_DIRS:
+        if not d:
+            continue
+        for ext in ('.dic', '.aff', '.exc'):
+            path = os.path.join(d, speller.tag + ext)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            parts.append(f'{path}:{st.st_size}:{st.st_mtime_ns}')
+    return '\0'.join(parts)
+
+
+class CachedSpeller:
+    """
+    Wrap a pyenchant Dict so check/suggest results persist across runs in a
+    shelve keyed by (dict tag, word). Words seen in earlier runs skip Hunspell.
+    The shelf is cleared when the dictionary fingerprint changes.
+    """
+
+    def __init__(self, speller, cache_path: str):
+        self.speller = speller
+        self.tag = speller.tag
+        fingerprint = dict_fingerprint(speller)
+        self.db = shelve.open(cache_path, flag='c')
+        if self.db.get(SPELL_CACHE_FINGERPRINT_KEY) != fingerprint:
+            # Dictionary or word list changed (or a shelf from before fingerprints): start fresh
+            self.db.close()
+            self.db = shelve.open(cache_path, flag='n')
+            self.db[SPELL_CACHE_FINGERPRINT_KEY] = fingerprint
+        atexit.register(self.db.close)
+        self.mem: Dict[str, object] = {}
+
+    def _cached(self, key: str, compute):
+        if key in self.mem:
+            return self.mem[key]
+        try:
+            val = self.db[key]
+        except KeyError:
+            val = compute()
+            self.db[key] = val
+        self.mem[key] = val
+        return val
+
+    def check(self, word: str) -> bool:
+        return self._cached(f'c:{self.tag}:{word}', lambda: bool(self.speller.check(word)))
+
+    def suggest(self, word: str) -> List[str]:
+        return list(self._cached(f's:{self.tag}:{word}', lambda: tuple(self.speller.suggest(word))))
+
+
+def open_dict():
     try:
         import enchant as enchant_mod
 
@@ -151,25 +335,47 @@ def init_speller():
         return None
 
 
-def is_allowed_word(
-    word: str,
-    field: str,
+@lru_cache(maxsize=1)
+def init_speller(cache_path: Optional[str] = None):
+    """Open the dictionary (and its cache shelf) once per process."""
+    speller = open_dict()
+    if speller is None:
+        return None
+    try:
+        cache_path = cache_path or default_spell_cache_path()
+        os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+        return CachedSpeller(speller, cache_path)
+    except Exception as e:
+        print(f'Warning: spelling cache unavailable ({e}); continuing without it.', file=sys.stderr)
+        return speller
+
+
+def combine_allowlists(
+    fields: List[str],
     global_allow: set,
     field_allow_map: Dict[str, set],
     custom_allow: set,
-) -> bool:
-    wl = word.lower()
-    if wl in global_allow:
-        return True
-    if wl in field_allow_map.get(field, set()):
-        return True
-    if wl in custom_allow:
-        return True
-    return False
+) -> Dict[str, frozenset]:
+    """One lowercase frozenset per field, so each token costs a single lookup."""
+    return {f: frozenset(global_allow | field_allow_map.get(f, set()) | custom_allow) for f in fields}
+
+
+def field_is_known_good(text: str, allowed: frozenset) -> bool:
+    """
+    Cheap pre-filter over the same WORD_RE tokens the spelling loop checks:
+    True when each was already accepted by the speller this run or is
+    allowlisted, so the loop cannot yield a suggestion. _known_good only holds
+    words speller.check accepted, so skipping never depends on file order.
+    """
+    for m in tokenize_words(text):
+        w = m.group(0)
+        if w not in _known_good and w.lower() not in allowed:
+            return False
+    return True
 
 
 def suggestion_confidence(misspelled: str, suggestion: str) -> float:
-    if not re.fullmatch(r"[A-Za-z][A-Za-z'\-]*", suggestion):
+    if not WORD_RE.fullmatch(suggestion):
         return 0.0
     base = difflib.SequenceMatcher(a=misspelled.lower(), b=suggestion.lower()).ratio()
     length_penalty = max(0.0, 1.0 - (abs(len(misspelled) - len(suggestion)) / max(1.0, len(misspelled))))
@@ -260,33 +466,16 @@ def build_replacers(old: str, new: str):
         if replace_inside_parens:
             return process_seg(original)
 
-        # Split original by parentheses and only process outside
-        segments = []
-        stack = []
-        last = 0
-        for i, ch in enumerate(original):
-            if ch == '(':
-                if not stack:
-                    segments.append(('out', original[last:i]))
-                    last = i
-                stack.append(i)
-            elif ch == ')':
-                if stack:
-                    stack.pop()
-                    if not stack:
-                        segments.append(('in', original[last : i + 1]))
-                        last = i + 1
-        segments.append(('out', original[last:]))
-
+        # Only process text outside parentheses
         out_parts = []
         total = 0
-        for typ, seg in segments:
-            if typ == 'out':
+        for inside, seg in split_paren_segments(original):
+            if inside:
+                out_parts.append(seg)
+            else:
                 seg2, n = process_seg(seg)
                 out_parts.append(seg2)
                 total += n
-            else:
-                out_parts.append(seg)
         return ''.join(out_parts), total
 
     def replace_everywhere(s: str) -> Tuple[str, int]:
@@ -298,22 +487,34 @@ def build_replacers(old: str, new: str):
     return replace_everywhere, replace_outside_parens
 
 
-def find_field_key_line(content: str, key: str) -> int:
-    for i, line in enumerate(content.splitlines(), start=1):
-        if f'"{key}"' in line:
-            return i
-    return 1
+def build_line_starts(content: str) -> List[int]:
+    """Offsets at which each line of content begins (computed once per file)."""
+    line_starts = [0]
+    i = content.find('\n')
+    while i != -1:
+        line_starts.append(i + 1)
+        i = content.find('\n', i + 1)
+    return line_starts
+
+
+def line_number_at(line_starts: List[int], index: int) -> int:
+    return bisect_right(line_starts, index)
 
 
-def find_match_line_for_word(content: str, key: str, word: str) -> int:
-    lines = content.splitlines(True)
-    start_line_idx = next((i for i, ln in enumerate(lines) if f'"{key}"' in ln), 0)
-    region = ''.join(lines[start_line_idx:])
-    m = re.search(rf'\b{re.escape(word)}\b', region)
+def find_field_key_line(content: str, key: str, line_starts: List[int]) -> int:
+    idx = content.find(f'"{key}"')
+    if idx == -1:
+        return 1
+    return line_number_at(line_starts, idx)
+
+
+def find_match_line_for_word(content: str, key: str, word: str, line_starts: List[int]) -> int:
+    key_idx = content.find(f'"{key}"')
+    start = line_starts[line_number_at(line_starts, key_idx) - 1] if key_idx != -1 else 0
+    m = re.compile(rf'\b{re.escape(word)}\b').search(content, start)
     if not m:
-        return find_field_key_line(content, key)
-    abs_index = sum(len(ln) for ln in lines[:start_line_idx]) + m.start()
-    return content[:abs_index].count('\n') + 1
+        return find_field_key_line(content, key, line_starts)
+    return line_number_at(line_starts, m.start())
 
 
 def collect_batch(
@@ -323,30 +524,31 @@ def collect_batch(
     min_conf: float,
     lowercase_only: bool,
     page_size: int,
-    global_allow: set,
-    field_allow_map: Dict[str, set],
-    custom_allow: set,
+    allow_by_field: Dict[str, frozenset],
 ):
     """
     Return up to page_size items:
-      dict: file, key, line, old, new, conf, apply_fn
+      dict: file, path, key, line, old, new, conf, apply_fn
+    apply_fn(data, replace_inside_parens) mutates the parsed data in place and
+    returns the number of occurrences changed.
     """
     batch = []
-    for name in sorted(os.listdir(base_dir)):
-        if not name.endswith('.json'):
-            continue
-        path = os.path.join(base_dir, name)
-        loaded = read_json_file(path)
+    for name, path in list_json_files(base_dir):
+        loaded = load_json_cached(path)
         if not loaded:
             continue
         data, content = loaded
+        line_starts = build_line_starts(content)
 
         def per_field(obj: Dict, key: str):
             nonlocal batch
             val = obj.get(key)
             if not isinstance(val, str):
                 return
+            allowed = allow_by_field[key]
             filtered = remove_parentheticals(val)
+            if field_is_known_good(filtered, allowed):
+                return
             for m in tokenize_words(filtered):
                 if len(batch) >= page_size:
                     return
@@ -355,11 +557,12 @@ def collect_batch(
                 if w.endswith("'") or w.endswith('’'):
                     continue
                 # Lowercase-first filter
-                if lowercase_only and not w.islower():
+                if lowercase_only and word_case(w) != 'lower':
                     continue
-                if is_allowed_word(w, key, global_allow, field_allow_map, custom_allow):
+                if w.lower() in allowed:
                     continue
                 if speller.check(w):
+                    _known_good.add(w)
                     continue
                 best = best_suggestion(speller, w, speller.suggest(w))
                 if not best:
@@ -368,21 +571,16 @@ def collect_batch(
                 if conf < min_conf:
                     continue
                 fixed = preserve_case(w, sug)
-                line = find_match_line_for_word(content, key, w)
+                line = find_match_line_for_word(content, key, w, line_starts)
 
                 def make_apply(pth: str, field_key: str, old_word: str, new_word: str):
                     replace_everywhere, replace_outside_parens = build_replacers(old_word, new_word)
 
-                    def apply_change(replace_inside_parens: bool, make_backup: bool = True):
-                        loaded2 = read_json_file(pth)
-                        if not loaded2:
-                            return 0
-                        data2, _content2 = loaded2
+                    def apply_change(data2, replace_inside_parens: bool) -> int:
                         occurrences = 0
-                        changed = False
 
                         def apply_to_obj(obj2: Dict):
-                            nonlocal occurrences, changed
+                            nonlocal occurrences
                             if field_key in obj2 and isinstance(obj2[field_key], str):
                                 before = obj2[field_key]
                                 # Pre-clean for line-wrap hyphenation artifacts
@@ -391,14 +589,12 @@ def collect_batch(
                                 if cleaned != before:
                                     obj2[field_key] = cleaned
                                     occurrences += 1  # count as one cleanup occurrence
-                                    changed = True
                                 # Now run replacer on the possibly cleaned text
                                 replacer = replace_everywhere if replace_inside_parens else replace_outside_parens
                                 after, n = replacer(source)
                                 if n > 0:
                                     obj2[field_key] = after
                                     occurrences += n
-                                    changed = True
 
                         if isinstance(data2, list):
                             for it in data2:
@@ -406,11 +602,7 @@ def collect_batch(
                                     apply_to_obj(it)
                         elif isinstance(data2, dict):
                             apply_to_obj(data2)
-                        if changed:
-                            if make_backup:
-                                shutil.copy2(pth, pth + '.bak')
-                            write_json_file(pth, data2)
-                        else:
+                        if not occurrences:
                             print(
                                 f"[debug] No change for {pth}:{field_key} '{old_word}' -> '{new_word}'",
                                 file=sys.stderr,
@@ -422,6 +614,7 @@ def collect_batch(
                 batch.append(
                     {
                         'file': name,
+                        'path': path,
                         'key': key,
                         'line': line,
                         'old': w,
@@ -499,46 +692,54 @@ def main():
         action='store_true',
         help='Also replace inside parentheses',
     )
+    ap.add_argument(
+        '--spell-cache',
+        metavar='PATH',
+        help='Spelling cache shelf (default: $XDG_CACHE_HOME/daily_devotional/spellcache)',
+    )
     args = ap.parse_args()
 
     if not (0.0 <= args.min_confidence <= 1.0):
         print('Error: --min-confidence must be between 0.0 and 1.0', file=sys.stderr)
         sys.exit(2)
 
-    speller = init_speller()
+    speller = init_speller(args.spell_cache)
     if not speller:
         print('Spelling checker not available; aborting.', file=sys.stderr)
         sys.exit(1)
 
     global_allow, field_allow_map, custom_allow = build_allowlists()
+    allow_by_field = combine_allowlists(args.fields, global_allow, field_allow_map, custom_allow)
 
     # Count mode
     if args.count:
         total = 0
-        for name in sorted(os.listdir(os.getcwd())):
-            if not name.endswith('.json'):
-                continue
-            path = os.path.join(os.getcwd(), name)
-            loaded = read_json_file(path)
+        for name, path in list_json_files(os.getcwd()):
+            loaded = load_json_cached(path)
             if not loaded:
                 continue
             data, content = loaded
+            line_starts = build_line_starts(content)
 
             def per_field_list(obj: Dict, key: str):
                 nonlocal total
                 val = obj.get(key)
                 if not isinstance(val, str):
                     return
+                allowed = allow_by_field[key]
                 filtered = remove_parentheticals(val)
+                if field_is_known_good(filtered, allowed):
+                    return
                 for m in tokenize_words(filtered):
                     w = m.group(0)
-                    if args.lowercase_first and not w.islower():
+                    if args.lowercase_first and word_case(w) != 'lower':
                         continue
                     if w.endswith("'") or w.endswith('’'):
                         continue
-                    if is_allowed_word(w, key, global_allow, field_allow_map, custom_allow):
+                    if w.lower() in allowed:
                         continue
                     if speller.check(w):
+                        _known_good.add(w)
                         continue
                     best = best_suggestion(speller, w, speller.suggest(w))
                     if not best:
@@ -546,7 +747,7 @@ def main():
                     sug, conf = best
                     if conf < args.min_confidence:
                         continue
-                    line = find_match_line_for_word(content, key, w)
+                    line = find_match_line_for_word(content, key, w, line_starts)
                     print(
                         f"code -g {name}:{line} | {key}: '{w}' -> '{preserve_case(w, sug)}'  [confidence: {conf:.2f}]"
                     )
@@ -572,9 +773,7 @@ def main():
         min_conf=args.min_confidence,
         lowercase_only=args.lowercase_first,
         page_size=args.page_size,
-        global_allow=global_allow,
-        field_allow_map=field_allow_map,
-        custom_allow=custom_allow,
+        allow_by_field=allow_by_field,
     )
 
     if not batch:
@@ -601,8 +800,17 @@ def main():
         sys.exit(0)
 
     total_occurrences = 0
+    touched: Dict[str, object] = {}
     for item in batch:
-        total_occurrences += item['apply_fn'](replace_inside_parens=args.replace_inside_parens)
+        loaded = load_json_cached(item['path'])
+        if not loaded:
+            continue
+        data, _content = loaded
+        n = item['apply_fn'](data, replace_inside_parens=args.replace_inside_parens)
+        if n:
+            touched[item['path']] = data
+        total_occurrences += n
+    write_touched_files(touched)
 
     print(f'Applied {total_occurrences} occurrence(s) across {len(batch)} suggestion(s).')
 
@@ -1,12 +1,25 @@
 #!/usr/bin/env python3
 import json
+import mmap
 import os
 import re
 import sys
 import unicodedata
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
 
+try:
+    import orjson
+except ImportError:  # optional; falls back to the stdlib json module
+    orjson = None
+
+from file_utils import decode_array_with_spans
+
 TARGET_FIELD = 'verse'
 
 # ---------------------------
@@ -80,18 +93,33 @@ NBSP_LIKE = ''.join(
     ]
 )
 
-try:
-    import regex as regex_mod  # type: ignore
-
-    HAS_REGEX = True
-except Exception:
-    regex_mod = None
-    HAS_REGEX = False
-
-if HAS_REGEX:
-    ZW_AND_FORMATS = regex_mod.compile(r'[' + re.escape(ZERO_WIDTHS + NBSP_LIKE) + r']|(\p{Cf})')
-else:
-    ZW_AND_FORMATS = re.compile(f'[{re.escape(ZERO_WIDTHS + NBSP_LIKE)}]')
+# Unicode format characters (Cf) as inclusive code point ranges (Unicode 14,
+# Python 3.11's unicodedata), so sanitation needs neither the third-party regex
+# module nor a scan of every code point at import
+CF_RANGES = (
+    (0x00AD, 0x00AD),
+    (0x0600, 0x0605),
+    (0x061C, 0x061C),
+    (0x06DD, 0x06DD),
+    (0x070F, 0x070F),
+    (0x0890, 0x0891),
+    (0x08E2, 0x08E2),
+    (0x180E, 0x180E),
+    (0x200B, 0x200F),
+    (0x202A, 0x202E),
+    (0x2060, 0x2064),
+    (0x2066, 0x206F),
+    (0xFEFF, 0xFEFF),
+    (0xFFF9, 0xFFFB),
+    (0x110BD, 0x110BD),
+    (0x110CD, 0x110CD),
+    (0x13430, 0x13438),
+    (0x1BCA0, 0x1BCA3),
+    (0x1D173, 0x1D17A),
+    (0xE0001, 0xE0001),
+    (0xE0020, 0xE007F),
+)
+CF_CHARS = ''.join(chr(cp) for lo, hi in CF_RANGES for cp in range(lo, hi + 1))
 
 PARENS_NORMALIZE = {
     '（': '(',
@@ -102,6 +130,11 @@ PARENS_NORMALIZE = {
     '❩': ')',
 }
 
+PARENS_TRANSLATE = str.maketrans(PARENS_NORMALIZE)
+
+# One C-level pass: exotic parens -> ASCII, zero-widths, NBSP-likes and Cf dropped
+SANITIZE_TABLE = str.maketrans({**PARENS_NORMALIZE, **{ch: None for ch in ZERO_WIDTHS + NBSP_LIKE + CF_CHARS}})
+
 # ---------------------------
 # Helpers
 # ---------------------------
@@ -111,17 +144,56 @@ def script_dir() -> str:
     return os.path.dirname(os.path.abspath(__file__))
 
 
-def read_json_file(path: str) -> Optional[Tuple[Any, str]]:
+UTF8_BOM = b'\xef\xbb\xbf'
+
+
+def read_text_skip_bom(path: str) -> str:
+    """
+    Read a file as bytes, drop leading BOMs before decoding, and apply the
+    same newline translation text mode would.
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    while raw.startswith(UTF8_BOM):
+        raw = raw[3:]
+    content = raw.decode('utf-8')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
+def read_json_file(path: str) -> Any:
     """
-    Read JSON text and strip a leading BOM if present to avoid first-record anomalies.
-    Return (parsed_object, original_text_without_bom).
+    Parse a JSON file, skipping leading BOMs. With orjson the bytes are parsed
+    straight from a read-only mmap, so no decoded copy of the file is held;
+    callers that need the text read it with read_text_skip_bom.
+    Return the parsed object, or None when the file cannot be read or parsed.
     """
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        if content.startswith('\ufeff'):
-            content = content.lstrip('\ufeff')
-        return json.loads(content), content
+        if not orjson:
+            return json.loads(read_text_skip_bom(path))
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            while mm[start : start + 3] == UTF8_BOM:
+                start += 3
+            with memoryview(mm)[start:] as view:
+                return orjson.loads(view)
+    except Exception:
+        return None
+
+
+def read_json_records(path: str) -> Optional[Tuple[Any, List[Tuple[int, int]], str]]:
+    """
+    Like read_json_file, but parse a top-level array and locate its element
+    spans in the same pass. Returns (parsed_object, spans, text); spans is
+    empty for non-array files.
+    """
+    try:
+        content = read_text_skip_bom(path)
+        if content.lstrip(' \t\n\r').startswith('['):
+            data, spans = decode_array_with_spans(content)
+            return data, spans, content
+        return (orjson.loads(content) if orjson else json.loads(content)), [], content
     except Exception:
         return None
 
@@ -133,17 +205,24 @@ def write_json_file(path: str, data: Any, original_text: str) -> bool:
     """
     backup = f'{path}.bak'
     try:
-        if not os.path.exists(backup):
-            with open(backup, 'w', encoding='utf-8') as bf:
-                bf.write(original_text)
+        # 'xb' creates exclusively (O_EXCL), folding the exists() probe into the open
+        with open(backup, 'xb') as bf:
+            bf.write(original_text.encode('utf-8'))
+    except FileExistsError:
+        pass
     except Exception as e:
         print(f'[ERROR] Cannot create backup {backup}: {e}', file=sys.stderr)
         return False
 
     try:
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-            f.write('\n')
+        # Serialize fully first (orjson when available); one large write goes
+        # straight through BufferedWriter to a single write(2)
+        if orjson:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2) + b'\n'
+        else:
+            payload = (json.dumps(data, ensure_ascii=False, indent=2) + '\n').encode('utf-8')
+        with open(path, 'wb') as f:
+            f.write(payload)
         return True
     except Exception as e:
         print(f'[ERROR] Cannot write {path}: {e}', file=sys.stderr)
@@ -154,26 +233,35 @@ def utc_date_only_now() -> str:
     return datetime.now(timezone.utc).strftime('%Y-%m-%d')
 
 
+# (format, literal it requires): strptime matches format literals exactly, so a
+# string lacking the literal cannot parse and the attempt is skipped
+DATE_FORMATS = [
+    ('%a, %d %b %Y %H:%M:%S %z', ','),
+    ('%a, %d %b %Y %H:%M %z', ','),
+    ('%d %b %Y %H:%M:%S %z', ':'),
+    ('%Y-%m-%d', '-'),
+]
+
+
 def parse_date_only_from_record(rec: Dict[str, Any]) -> Optional[str]:
     raw = rec.get('dateutc') or rec.get('date_utc')
     if not isinstance(raw, str) or not raw.strip():
         return None
-    fmts = [
-        '%a, %d %b %Y %H:%M:%S %z',
-        '%a, %d %b %Y %H:%M %z',
-        '%d %b %Y %H:%M:%S %z',
-        '%Y-%m-%d',
-    ]
-    s = raw.strip()
-    for fmt in fmts:
+    return _date_only_from_string(raw.strip())
+
+
+@lru_cache(maxsize=1024)
+def _date_only_from_string(s: str) -> Optional[str]:
+    # Records in a file share a handful of dates; parse each distinct one once
+    for fmt, required in DATE_FORMATS:
+        if required not in s:
+            continue
         try:
             dt = datetime.strptime(s, fmt)
             return dt.astimezone(timezone.utc).strftime('%Y-%m-%d')
         except Exception:
             continue
     try:
-        from email.utils import parsedate_to_datetime
-
         dt = parsedate_to_datetime(s)
         if dt is not None:
             if dt.tzinfo is None:
@@ -184,21 +272,29 @@ def parse_date_only_from_record(rec: Dict[str, Any]) -> Optional[str]:
     return None
 
 
+@lru_cache(maxsize=8192)
 def sanitize_verse(text: str) -> str:
     """
     Strong unicode sanitation:
     - NFKC normalize
-    - remove zero-widths, NBSP-like, and Unicode format chars (Cf) if regex module available
+    - remove zero-widths, NBSP-like, and Unicode format chars (Cf)
     - collapse any whitespace to a single ASCII space
     - normalize exotic parentheses to ASCII
     - strip
     """
-    s = unicodedata.normalize('NFKC', text)
-    s = ZW_AND_FORMATS.sub('', s)
-    if any(ch in s for ch in PARENS_NORMALIZE):
-        s = ''.join(PARENS_NORMALIZE.get(ch, ch) for ch in s)
-    s = re.sub(r'\s+', ' ', s)
-    return s.strip()
+    # ASCII is already NFKC and holds nothing the table would change
+    s = text if text.isascii() else unicodedata.normalize('NFKC', text).translate(SANITIZE_TABLE)
+    # str.split() uses the same whitespace set as re's \s; split/join collapses
+    # runs and strips the ends without a regex pass
+    return ' '.join(s.split())
+
+
+DASH_PAD = re.compile(r'\s*-\s*')
+COMMA_PAD = re.compile(r'\s*,\s*')
+FIRST_VERSE_SUFFIX = re.compile(r'^(\d+)([A-Ca-c])$')
+# A verse tail is only digits, dashes, commas and spaces, so every A-C in it
+# is a suffix on a verse number; lowercase them without a per-match callback
+SUFFIX_LOWER = str.maketrans('ABC', 'abc')
 
 
 def _normalize_verses(first: str, tail: Optional[str]) -> str:
@@ -208,20 +304,53 @@ def _normalize_verses(first: str, tail: Optional[str]) -> str:
     - Remove spaces around '-' and ','
     - Lowercase any letter suffixes (e.g., 21B -> 21b)
     """
-    first = re.sub(r'^(\d+)([A-Ca-c])$', lambda m: m.group(1) + m.group(2).lower(), first)
+    if FIRST_VERSE_SUFFIX.match(first):
+        first = first.lower()
     if not tail:
         return first
     t = tail.replace('–', '-').replace('—', '-')
-    t = re.sub(r'\s*-\s*', '-', t)
-    t = re.sub(r'\s*,\s*', ',', t)
-    t = re.sub(r'(\d+)([A-Ca-c])', lambda m: m.group(1) + m.group(2).lower(), t)
-    return first + t
+    t = DASH_PAD.sub('-', t)
+    t = COMMA_PAD.sub(',', t)
+    return first + t.translate(SUFFIX_LOWER)
+
+
+COLON_CHARS = (':', '\u2236', '\uff1a', '\ufe55')
+DASH_CHARS = ('-', '–', '—')
+
+# Start of the first digit run that could be a chapter: any digit for the
+# chapter-only pattern, a digit run followed by a colon + digit otherwise
+FIRST_DIGIT_RUN = re.compile(r'\d')
+FIRST_CH_VERSE_RUN = re.compile(r'(?<!\d)\d+\s*[:\u2236\uFF1A\uFE55]\s*\d')
+
+# Everything the book group may span, matched against the reversed text
+BOOK_SPAN_REVERSED = re.compile(r'[A-Za-z.\s]*')
+
+
+def _scan_start(s: str, chapter_idx: int) -> int:
+    """
+    Earliest offset a book reference can start at when its chapter digits are
+    the first candidate run, found at chapter_idx. The book group only spans
+    letters, periods and whitespace, plus one numeric prefix and one boundary
+    char before it, so every earlier start is bound to fail and can be skipped.
+    """
+    book_len = BOOK_SPAN_REVERSED.match(s[chapter_idx - 1 :: -1] if chapter_idx else '').end()
+    return max(chapter_idx - book_len - 2, 0)
+
+
+def _last_match(pattern: re.Pattern, s: str, pos: int = 0) -> Optional[re.Match]:
+    # deque(maxlen=1) drains finditer in C, keeping only the final match
+    tail = deque(pattern.finditer(s, pos), maxlen=1)
+    return tail[0] if tail else None
 
 
 def _find_last_book_ch_vers(s: str) -> Optional[str]:
-    last = None
-    for m in BOOK_REF_WITH_VERSES.finditer(s):
-        last = m
+    # A chapter:verse reference needs a colon (or lookalike) somewhere
+    if not any(c in s for c in COLON_CHARS):
+        return None
+    first = FIRST_CH_VERSE_RUN.search(s)
+    if not first:
+        return None
+    last = _last_match(BOOK_REF_WITH_VERSES, s, _scan_start(s, first.start()))
     if last:
         book = sanitize_verse(last.group(1))
         ch = last.group(2)
@@ -233,9 +362,10 @@ def _find_last_book_ch_vers(s: str) -> Optional[str]:
 
 
 def _find_last_book_ch_only(s: str) -> Optional[str]:
-    last = None
-    for m in BOOK_REF_CHAPTER_ONLY.finditer(s):
-        last = m
+    first = FIRST_DIGIT_RUN.search(s)
+    if not first:
+        return None
+    last = _last_match(BOOK_REF_CHAPTER_ONLY, s, _scan_start(s, first.start()))
     if last:
         book = sanitize_verse(last.group(1))
         ch = last.group(2)
@@ -249,6 +379,12 @@ def extract_bibleish(text: str) -> Optional[str]:
     """
     if not isinstance(text, str):
         return None
+    return _extract_bibleish_cached(text)
+
+
+@lru_cache(maxsize=4096)
+def _extract_bibleish_cached(text: str) -> Optional[str]:
+    # The corpus repeats canonical verses; memoize the sanitize + two scans
     s = sanitize_verse(text)
     ref = _find_last_book_ch_vers(s)
     if ref:
@@ -266,111 +402,89 @@ def is_chapter_reference(ref: str) -> bool:
     return isinstance(ref, str) and ':' not in ref and bool(ref.strip())
 
 
-def emit_found(filename: str, date_only: str, reference: str, print_only_misses: bool) -> None:
+def emit_found(filename: str, date_only: str, reference: str, print_only_misses: bool) -> Optional[str]:
     if not print_only_misses:
-        print(f'{filename}, {date_only}: {reference}')
+        return f'{filename}, {date_only}: {reference}'
+    return None
 
 
-def emit_miss(filename: str, date_only: str, line: int, line_text: str) -> None:
-    print(f'{filename}, {date_only}, {line}:DNL')
-    print(f'code -g {filename}:{line}')
-    print(line_text)
+def emit_miss(filename: str, date_only: str, line: int, line_text: str) -> str:
+    return f'{filename}, {date_only}, {line}:DNL\ncode -g {filename}:{line}\n{line_text}'
 
 
-def emit_chapter(filename: str, date_only: str, line: int, line_text: str, reference: str) -> None:
+def emit_chapter(filename: str, date_only: str, line: int, line_text: str, reference: str) -> str:
     """
-    Emit a chapter-only reference finding with a distinctive tag.
+    Report a chapter-only reference finding with a distinctive tag.
     """
-    print(f'{filename}, {date_only}, {line}:DNL-CHAPTER {reference}')
-    print(f'code -g {filename}:{line}')
-    print(line_text)
+    return f'{filename}, {date_only}, {line}:DNL-CHAPTER {reference}\ncode -g {filename}:{line}\n{line_text}'
 
 
 # ---------- Robust per-object logging support ----------
 
 
-def find_top_level_object_spans(content: str) -> List[Tuple[int, int]]:
+def build_newline_index(content: str) -> List[int]:
     """
-    For a JSON array file, return [(start_index, end_index_exclusive)] for each top-level object.
-    Simple scanner that assumes the top-level is a JSON array of objects.
+    Offsets of every newline in content, built once per file so line numbers
+    can be looked up by bisection instead of re-counting from the start.
     """
-    spans: List[Tuple[int, int]] = []
-    start_arr = content.find('[')
-    end_arr = content.rfind(']')
-    if start_arr == -1 or end_arr == -1 or end_arr <= start_arr:
-        return spans
+    nl_offsets: List[int] = []
+    i = content.find('\n')
+    while i != -1:
+        nl_offsets.append(i)
+        i = content.find('\n', i + 1)
+    return nl_offsets
 
-    i = start_arr + 1
-    n = end_arr
-    while i < n:
-        while i < n and content[i] in ' \t\r\n,':
-            i += 1
-        if i >= n:
-            break
-        if content[i] != '{':
-            i += 1  # skip until next object
-            continue
-
-        depth = 0
-        j = i
-        in_string = False
-        escape = False
-        while j <= end_arr:
-            ch = content[j]
-            if in_string:
-                if escape:
-                    escape = False
-                elif ch == '\\':
-                    escape = True
-                elif ch == '"':
-                    in_string = False
-            else:
-                if ch == '"':
-                    in_string = True
-                elif ch == '{':
-                    depth += 1
-                elif ch == '}':
-                    depth -= 1
-                    if depth == 0:
-                        spans.append((i, j + 1))
-                        i = j + 1
-                        break
-            j += 1
-        else:
-            break
 
-    return spans
+# One pattern for every record: capture the raw JSON string body and compare it
+# to the wanted value, instead of compiling a pattern per verse value
+VERSE_LINE_RE = re.compile(r'^\s*"verse"\s*:\s*"((?:[^"\\]|\\.)*)"\s*(?:,|})', re.MULTILINE)
 
 
-def count_lines_up_to(content: str, idx: int) -> int:
-    """
-    Count lines (1-based) up to idx (exclusive).
-    """
-    return content.count('\n', 0, idx) + 1
+def _json_string_equals(raw: str, value: str) -> bool:
+    if raw == value:
+        return True
+    if '\\' not in raw:
+        return False
+    try:
+        return json.loads(f'"{raw}"') == value
+    except ValueError:
+        return False
 
 
-def best_line_for_verse_in_object(obj_text: str, verse_value: str, object_start_line: int) -> Tuple[int, str]:
+def best_line_for_verse_in_object(
+    content: str, span: Tuple[int, int], verse_value: str, nl_offsets: List[int]
+) -> Tuple[int, str]:
     """
-    Try to find the exact verse line within the object text slice.
+    Try to find the exact verse line within the object span of content.
     If found, return that line number and text; otherwise return the object's first line.
+    Works on offsets only; no per-object slice or line list is built.
     """
-    lines = obj_text.splitlines()
-    rel_line = None
-    escaped_val = re.escape(verse_value if isinstance(verse_value, str) else '')
-    pat = re.compile(r'^\s*"verse"\s*:\s*"' + escaped_val + r'"\s*(?:,|})', re.MULTILINE)
-    m = pat.search(obj_text)
-    if m:
-        rel_line = obj_text.count('\n', 0, m.start()) + 1
-    else:
-        for i, line in enumerate(lines, start=1):
-            if '"verse"' in line:
-                rel_line = i
-                break
-    if rel_line is None:
-        rel_line = 1
-    abs_line = object_start_line + (rel_line - 1)
-    line_text = lines[rel_line - 1] if 1 <= rel_line <= len(lines) else ''
-    return abs_line, line_text
+    start, end = span
+    hit = start
+    # Literal prefix check first: no '"verse"' key means neither lookup can hit
+    key_idx = content.find('"verse"', start, end)
+    if key_idx != -1:
+        value = verse_value if isinstance(verse_value, str) else ''
+        # Common case: the value appears exactly as json.dump writes it after
+        # the key (escapes included); str.find beats re
+        needle = json.dumps(value, ensure_ascii=False)
+        idx = content.find(f'"verse": {needle}', key_idx, end)
+        if idx == -1:
+            idx = content.find(f'"verse":{needle}', key_idx, end)
+        if idx != -1:
+            hit = idx
+        else:
+            hit = key_idx
+            pos = max(content.rfind('\n', start, key_idx) + 1, start)
+            for m in VERSE_LINE_RE.finditer(content, pos, end):
+                if _json_string_equals(m.group(1), value):
+                    hit = m.start()
+                    break
+    # The newline table already brackets the hit line; no rfind/find rescans
+    k = bisect_left(nl_offsets, hit)
+    line_start = max(nl_offsets[k - 1] + 1, start) if k else start
+    line_end = nl_offsets[k] if k < len(nl_offsets) and nl_offsets[k] < end else end
+    return k + 1, content[line_start:line_end]
 
 
 # ------------------------------------------------------------
@@ -413,6 +527,12 @@ def _norm_roman_to_arabic(roman: str) -> str:
     return ROMAN_TO_ARABIC.get(roman, roman)
 
 
+def _roman_in_text_repl(m: re.Match) -> str:
+    prefix = m.group('prefix') or ''
+    arabic = _norm_roman_to_arabic(m.group('num'))
+    return f'{prefix}{arabic} {m.group("book")} {m.group("chapvers")}'
+
+
 def normalize_roman_in_verse_value(
     verse_val: str,
 ) -> Tuple[str, Optional[Dict[str, str]]]:
@@ -427,7 +547,7 @@ def normalize_roman_in_verse_value(
 
     # Try whole-field replacement first (strict, accurate)
     s = sanitize_verse(verse_val)
-    m = ROMAN_LEAD_FULL.match(s)
+    m = ROMAN_LEAD_FULL.match(s) if 'I' in s else None
     if m:
         arabic = _norm_roman_to_arabic(m.group('num'))
         updated_core = f'{arabic} {m.group("book")} {m.group("chapvers")}'
@@ -440,19 +560,10 @@ def normalize_roman_in_verse_value(
         return verse_val, None
 
     # Fallback: in-text replacement within verse (keeps surrounding prose)
-    changed = False
-
-    def repl(m: re.Match) -> str:
-        nonlocal changed
-        prefix = m.group('prefix') or ''
-        arabic = _norm_roman_to_arabic(m.group('num'))
-        out = f'{prefix}{arabic} {m.group("book")} {m.group("chapvers")}'
-        if m.group(0) != out:
-            changed = True
-        return out
-
-    updated = ROMAN_LEAD_IN_TEXT.sub(repl, verse_val)
-    if changed and updated != verse_val:
+    if 'I' not in verse_val:
+        return verse_val, None
+    updated = ROMAN_LEAD_IN_TEXT.sub(_roman_in_text_repl, verse_val)
+    if updated != verse_val:
         return updated, {'from': verse_val, 'to': updated}
     return verse_val, None
 
@@ -492,9 +603,15 @@ def normalize_hyphen_ref_at_end(verse_val: str) -> Tuple[str, Optional[Dict[str,
         return verse_val, None
 
     # NFKC + normalize exotic parentheses just for matching; output uses original text
-    s = unicodedata.normalize('NFKC', verse_val)
-    s = ''.join(PARENS_NORMALIZE.get(ch, ch) for ch in s)
+    if verse_val.isascii():
+        s = verse_val
+    else:
+        s = unicodedata.normalize('NFKC', verse_val).translate(PARENS_TRANSLATE)
 
+    # The pattern needs a dash separator and a chapter:verse colon; skip the
+    # lazy prefix scan for the many verses that have neither
+    if not any(c in s for c in DASH_CHARS) or not any(c in s for c in COLON_CHARS):
+        return verse_val, None
     m = HYPHEN_REF_AT_END.match(s)
     if not m:
         return verse_val, None
@@ -506,8 +623,8 @@ def normalize_hyphen_ref_at_end(verse_val: str) -> Tuple[str, Optional[Dict[str,
     book = sanitize_verse(m.group('book'))
     ch = m.group('ch')
     vers = m.group('vers').replace('–', '-').replace('—', '-')
-    vers = re.sub(r'\s*-\s*', '-', vers)
-    vers = re.sub(r'\s*,\s*', ',', vers)
+    vers = DASH_PAD.sub('-', vers)
+    vers = COMMA_PAD.sub(',', vers)
 
     # Trim trailing spaces before the hyphen segment to avoid double spaces
     new_core = f'{prefix_orig.rstrip()} ({book} {ch}:{vers})'
@@ -552,50 +669,34 @@ def normalize_file(path: str, name: str, preview: bool) -> Tuple[int, int, List[
     Normalize references for a single JSON file (verse-only).
     Returns (total_records, changed_records, change_entries)
     """
-    loaded = read_json_file(path)
-    if not loaded:
+    data = read_json_file(path)
+    if isinstance(data, list):
+        records = data
+    elif isinstance(data, dict):
+        records = [data]
+    else:
         return 0, 0, []
-    data, original_text = loaded
 
-    total = 0
     changed = 0
     entries: List[Dict[str, str]] = []
-
-    def record_change(idx: int, key: str, ch: Dict[str, str]) -> None:
-        entries.append(
-            {
-                'file': name,
-                'index': str(idx),
-                'field': key,
-                'from': ch['from'],
-                'to': ch['to'],
-            }
-        )
-
-    if isinstance(data, list):
-        for i, item in enumerate(data, start=1):
-            total += 1
-            if isinstance(item, dict):
-                ch = normalize_record_refs(item)
-                if ch:
-                    changed += 1
-                    if 'verse-hyphen' in ch:
-                        record_change(i, 'verse', ch['verse-hyphen'])
-                    if 'verse-roman' in ch:
-                        record_change(i, 'verse', ch['verse-roman'])
-        if not preview and changed > 0:
-            write_json_file(path, data, original_text)
-    elif isinstance(data, dict):
-        total = 1
-        ch = normalize_record_refs(data)
-        if ch:
-            changed = 1
-            if 'verse-hyphen' in ch:
-                record_change(1, 'verse', ch['verse-hyphen'])
-            if 'verse-roman' in ch:
-                record_change(1, 'verse', ch['verse-roman'])
-        if not preview and changed > 0:
-            write_json_file(path, data, original_text)
+    normalize = normalize_record_refs
+    for i, item in enumerate(records, start=1):
+        # Most records have nothing to rewrite; skip the call when there is no verse string
+        if not isinstance(item, dict) or not isinstance(item.get('verse'), str):
+            continue
+        ch = normalize(item)
+        if not ch:
+            continue
+        changed += 1
+        for key in ('verse-hyphen', 'verse-roman'):
+            if key in ch:
+                entries.append(
+                    {'file': name, 'index': str(i), 'field': 'verse', 'from': ch[key]['from'], 'to': ch[key]['to']}
+                )
+    if not preview and changed > 0:
+        # The text is only needed for the .bak, so read it once a file actually changes
+        write_json_file(path, data, read_text_skip_bom(path))
+    total = len(records)
     return total, changed, entries
 
 
@@ -611,10 +712,11 @@ def process_record(
     default_date_only: str,
     print_only_misses: bool,
     is_first_record_in_file: bool,
-    object_text: Optional[str] = None,
-    object_start_line: Optional[int] = None,
+    object_span: Optional[Tuple[int, int]] = None,
+    nl_offsets: Optional[List[int]] = None,
     report_chapters: bool = False,
-) -> None:
+) -> Optional[str]:
+    """The report for one record, or None when it has nothing to report."""
     date_only = parse_date_only_from_record(rec) or default_date_only
     verse = rec.get(TARGET_FIELD)
 
@@ -625,36 +727,41 @@ def process_record(
                 # Only emit if it's a chapter-only reference
                 if is_chapter_reference(ref):
                     # Find a good line to point the editor to
-                    if object_text is not None and object_start_line is not None:
-                        line_no, line_text = best_line_for_verse_in_object(object_text, verse, object_start_line)
+                    if object_span is not None and nl_offsets is not None:
+                        line_no, line_text = best_line_for_verse_in_object(file_content, object_span, verse, nl_offsets)
                     else:
                         line_no, line_text = 1, ''
-                    emit_chapter(filename, date_only, line_no, line_text, ref)
+                    return emit_chapter(filename, date_only, line_no, line_text, ref)
                 # When reporting chapters, suppress normal found output
-                return
+                return None
             else:
-                emit_found(filename, date_only, ref, print_only_misses)
-                return
+                return emit_found(filename, date_only, ref, print_only_misses)
 
         # Miss: pick the best line from the object slice if available
-        if object_text is not None and object_start_line is not None:
-            line_no, line_text = best_line_for_verse_in_object(object_text, verse, object_start_line)
+        if object_span is not None and nl_offsets is not None:
+            line_no, line_text = best_line_for_verse_in_object(file_content, object_span, verse, nl_offsets)
         else:
             line_no, line_text = 1, ''
         # In chapter-report mode, only chapters are reported; other misses are ignored
         if not report_chapters:
-            emit_miss(filename, date_only, line_no, line_text)
-        return
+            return emit_miss(filename, date_only, line_no, line_text)
+        return None
 
     # Missing or non-string verse
-    if object_text is not None and object_start_line is not None:
+    if object_span is not None and nl_offsets is not None:
         line_no, line_text = best_line_for_verse_in_object(
-            object_text, verse if isinstance(verse, str) else '', object_start_line
+            file_content, object_span, verse if isinstance(verse, str) else '', nl_offsets
         )
     else:
         line_no, line_text = 1, ''
     if not report_chapters:
-        emit_miss(filename, date_only, line_no, line_text)
+        return emit_miss(filename, date_only, line_no, line_text)
+    return None
+
+
+def join_reports(reports: List[Optional[str]]) -> str:
+    """Reports as printed output, one per line; None entries are skipped."""
+    return ''.join(report + '\n' for report in reports if report is not None)
 
 
 def process_file(
@@ -663,58 +770,84 @@ def process_file(
     default_date_only: str,
     print_only_misses: bool,
     report_chapters: bool,
-) -> None:
-    loaded = read_json_file(path)
+) -> str:
+    """The report for one file: one entry per record with something to report."""
+    # Unreadable file or non-object record: a DNL line followed by a blank line
+    unreadable = None if report_chapters else f'{name}, {default_date_only}, 1:DNL\n'
+    loaded = read_json_records(path)
     if not loaded:
-        if not report_chapters:
-            print(f'{name}, {default_date_only}, 1:DNL')
-            print('')
-        return
+        return join_reports([unreadable])
+
+    reports: List[Optional[str]] = []
 
-    data, content = loaded
+    data, spans, content = loaded
+    nl_offsets = build_newline_index(content)
     if isinstance(data, list):
-        spans = find_top_level_object_spans(content)
         first = True
         for idx, item in enumerate(data):
             if isinstance(item, dict):
-                obj_text = None
-                obj_start_line = None
-                if idx < len(spans):
-                    start, end = spans[idx]
-                    obj_text = content[start:end]
-                    obj_start_line = count_lines_up_to(content, start)
-                process_record(
+                report = process_record(
                     item,
                     name,
                     content,
                     default_date_only,
                     print_only_misses,
                     is_first_record_in_file=first,
-                    object_text=obj_text,
-                    object_start_line=obj_start_line,
+                    object_span=spans[idx] if idx < len(spans) else None,
+                    nl_offsets=nl_offsets,
                     report_chapters=report_chapters,
                 )
             else:
-                if not report_chapters:
-                    print(f'{name}, {default_date_only}, 1:DNL')
-                    print('')
+                report = unreadable
+            reports.append(report)
             first = False
     elif isinstance(data, dict):
-        process_record(
-            data,
-            name,
-            content,
-            default_date_only,
-            print_only_misses,
-            is_first_record_in_file=True,
-            object_text=content,
-            object_start_line=1,
-            report_chapters=report_chapters,
+        reports.append(
+            process_record(
+                data,
+                name,
+                content,
+                default_date_only,
+                print_only_misses,
+                is_first_record_in_file=True,
+                object_span=(0, len(content)),
+                nl_offsets=nl_offsets,
+                report_chapters=report_chapters,
+            )
         )
     else:
-        if not report_chapters:
-            print(f'{name}, {default_date_only}, 1:DNL')
-            print('')
+        reports.append(unreadable)
+    return join_reports(reports)
+
+
+def _process_file_job(job: Tuple[str, str, str, bool, bool]) -> str:
+    return process_file(*job)
+
+
+def run_process_files(jobs: List[Tuple[str, str, str, bool, bool]], workers: int) -> None:
+    """
+    Print process_file reports in job order, fanning out to a process pool
+    when there is more than one file and more than one worker.
+    """
+    if workers <= 1 or len(jobs) < 2:
+        for job in jobs:
+            sys.stdout.write(process_file(*job))
+        return
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        for report in ex.map(_process_file_job, jobs, chunksize=4):
+            sys.stdout.write(report)
+
+
+def run_normalize_files(targets: List[str], preview: bool, workers: int) -> List[Tuple[int, int, List[Dict[str, str]]]]:
+    """
+    normalize_file over targets, in target order. Files are independent, so
+    more than one target and worker fans out to a process pool.
+    """
+    names = [os.path.basename(path) for path in targets]
+    if workers <= 1 or len(targets) < 2:
+        return [normalize_file(path, name, preview) for path, name in zip(targets, names)]
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(normalize_file, targets, names, [preview] * len(targets), chunksize=4))
 
 
 # ------------------------------------------------------------
@@ -722,6 +855,15 @@ def process_file(
 # ------------------------------------------------------------
 
 
+def list_json_entries(base: str) -> List[Tuple[str, str]]:
+    """
+    Sorted (name, path) pairs for *.json entries in base, from a single
+    os.scandir pass.
+    """
+    with os.scandir(base) as it:
+        return sorted((e.name, e.path) for e in it if e.name.endswith('.json'))
+
+
 def _oneline(s: str) -> str:
     if s is None:
         return ''
@@ -760,6 +902,12 @@ def main():
         action='store_true',
         help='With --normalize_refs, preview changes (cur/upd) but do not modify files.',
     )
+    ap.add_argument(
+        '--workers',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Worker processes for the extraction and normalization passes (default: CPU count; 1 disables the pool).',
+    )
     ap.add_argument(
         'filenames',
         nargs='*',
@@ -774,36 +922,28 @@ def main():
     # First, run the existing extraction/reporting pass (unchanged behavior)
     if args.filenames:
         exit_code = 0
+        jobs = []
         for path in args.filenames:
             name = os.path.basename(path)
             if not os.path.isfile(path):
                 print(f'Error: not a file or not found: {path}', file=sys.stderr)
                 exit_code = 1
                 continue
-            process_file(path, name, default_date_only, print_only_misses, report_chapters)
+            jobs.append((path, name, default_date_only, print_only_misses, report_chapters))
+        run_process_files(jobs, args.workers)
         if not args.normalize_refs:
             sys.exit(exit_code)
     else:
         base = args.dir or script_dir()
         try:
-            entries = sorted(os.listdir(base))
+            entries = list_json_entries(base)
         except Exception as e:
             print(f'Error reading directory {base}: {e}', file=sys.stderr)
             sys.exit(1)
 
-        files_seen = 0
-        for name in entries:
-            if not name.endswith('.json'):
-                continue
-            files_seen += 1
-            process_file(
-                os.path.join(base, name),
-                name,
-                default_date_only,
-                print_only_misses,
-                report_chapters,
-            )
-        if files_seen == 0:
+        jobs = [(path, name, default_date_only, print_only_misses, report_chapters) for name, path in entries]
+        run_process_files(jobs, args.workers)
+        if not jobs:
             print('No JSON files found', file=sys.stderr)
             if not args.normalize_refs:
                 sys.exit(1)
@@ -815,7 +955,7 @@ def main():
         else:
             base = args.dir or script_dir()
             try:
-                targets = [os.path.join(base, n) for n in sorted(os.listdir(base)) if n.endswith('.json')]
+                targets = [path for _, path in list_json_entries(base)]
             except Exception as e:
                 print(f'Error reading directory {base}: {e}', file=sys.stderr)
                 sys.exit(1)
@@ -824,9 +964,7 @@ def main():
         grand_changed = 0
         all_entries: List[Dict[str, str]] = []
 
-        for path in targets:
-            name = os.path.basename(path)
-            t, c, ents = normalize_file(path, name, preview=args.preview)
+        for t, c, ents in run_normalize_files(targets, args.preview, args.workers):
             grand_total += t
             grand_changed += c
             all_entries.extend(ents)
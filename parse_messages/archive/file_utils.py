@@ -0,0 +1,95 @@
+"""
+File and JSON layout helpers shared by the archive scripts.
+"""
+
+import json
+import os
+import re
+import shutil
+from typing import Any, Dict, List, Tuple, Union
+
+
+def write_bytes_atomic(path: Union[str, os.PathLike], data: bytes) -> None:
+    """
+    Write data to path through a sibling <path>.tmp that is renamed over it,
+    so a crash mid-write never leaves path truncated. An existing path keeps
+    its permission bits, and the temp file is removed if anything fails.
+    """
+    path = os.fspath(path)
+    tmp = path + '.tmp'
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        if os.path.exists(path):
+            shutil.copymode(path, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+_DECODER = json.JSONDecoder()
+_JSON_WS = re.compile(r'[ \t\n\r]*')
+
+
+def decode_array_with_spans(content: str) -> Tuple[List[Any], List[Tuple[int, int]]]:
+    """
+    Parse a top-level JSON array in one pass with JSONDecoder.raw_decode,
+    returning the items and their [start, end) spans in content. spans[i]
+    lines up with items[i]. Raises ValueError on anything json.loads rejects.
+    """
+    ws = _JSON_WS.match
+    items: List[Any] = []
+    spans: List[Tuple[int, int]] = []
+    i = ws(content, 0).end()
+    if content[i : i + 1] != '[':
+        raise ValueError('not a JSON array')
+    i = ws(content, i + 1).end()
+    if content[i : i + 1] == ']':
+        i += 1
+    else:
+        while True:
+            item, j = _DECODER.raw_decode(content, i)
+            items.append(item)
+            spans.append((i, j))
+            i = ws(content, j).end()
+            sep = content[i : i + 1]
+            if sep == ',':
+                i = ws(content, i + 1).end()
+            elif sep == ']':
+                i += 1
+                break
+            else:
+                raise ValueError(f'expected , or ] at {i}')
+    if ws(content, i).end() != len(content):
+        raise ValueError(f'extra data at {i}')
+    return items, spans
+
+
+def object_key_offsets(content: str, start: int) -> Dict[str, int]:
+    """
+    Offsets of the top-level member keys of the JSON object at content[start].
+    Keys of nested objects are skipped, so each record answers for its own
+    keys only. A repeated key maps to its last occurrence, like json.loads.
+    """
+    ws = _JSON_WS.match
+    offsets: Dict[str, int] = {}
+    if content[start : start + 1] != '{':
+        return offsets
+    i = ws(content, start + 1).end()
+    if content[i : i + 1] == '}':
+        return offsets
+    while True:
+        key, j = _DECODER.raw_decode(content, i)
+        offsets[key] = i
+        j = ws(content, j).end()
+        if content[j : j + 1] != ':':
+            raise ValueError(f'expected : at {j}')
+        _, j = _DECODER.raw_decode(content, ws(content, j + 1).end())
+        i = ws(content, j).end()
+        if content[i : i + 1] != ',':
+            return offsets
+        i = ws(content, i + 1).end()
@@ -4,7 +4,9 @@ import os
 import re
 import shutil
 import sys
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
+
+from file_utils import decode_array_with_spans, object_key_offsets
 
 # Default fields to process
 DEFAULT_FIELDS = ['subject', 'verse', 'reflection', 'prayer', 'reading']
@@ -57,9 +59,35 @@ ABBR_TO_FULL = {
     'Mal': 'Malachi',
 }
 
+
+def trie_alternation(words) -> str:
+    """
+    Regex alternation for a set of literals, factored into a prefix trie so
+    the engine branches once per character instead of retrying every word.
+    Longer words are still tried first, as with a longest-first alternation.
+    """
+    trie: Dict[str, dict] = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
 # Build combined regex: whole-word abbr with optional dot and optional space
-ABBR_ALT = '|'.join(sorted(map(re.escape, ABBR_TO_FULL.keys()), key=len, reverse=True))
+ABBR_ALT = trie_alternation(ABBR_TO_FULL.keys())
 PATTERN = re.compile(rf'\b(?P<abbr>{ABBR_ALT})(?P<dot>\.)?(?P<sp>\s?)\b')
+# Any abbreviation literal at all; files without one cannot match PATTERN
+ANY_ABBR = re.compile(ABBR_ALT)
 DIGITS_AHEAD = re.compile(r'^\s*\d')
 
 SEPARATOR = '=' * 72  # section break
@@ -69,13 +97,23 @@ def script_dir() -> str:
     return os.path.dirname(os.path.abspath(__file__))
 
 
-def read_json_file(path: str):
+def read_json_file(path: str, require: Optional[re.Pattern] = None):
+    """
+    Return (data, content, spans); spans[i] is the [start, end) span of
+    data[i] for a top-level array and empty otherwise. With require, skip the
+    JSON parse and return (None, content, []) when the raw text has no match.
+    """
     try:
         with open(path, 'r', encoding='utf-8') as f:
             content = f.read()
-        return json.loads(content), content
+        if require is not None and not require.search(content):
+            return None, content, []
+        if content.lstrip(' \t\n\r').startswith('['):
+            data, spans = decode_array_with_spans(content)
+            return data, content, spans
+        return json.loads(content), content, []
     except Exception:
-        return None, None
+        return None, None, []
 
 
 def write_json_file(path: str, data) -> str:
@@ -85,11 +123,10 @@ def write_json_file(path: str, data) -> str:
     return text
 
 
-def find_line_number_for_field(content: str, key: str, value: str) -> int:
-    for i, line in enumerate(content.splitlines(), start=1):
-        if f'"{key}"' in line:
-            return i
-    return 1
+def key_line(content: str, start: int, key: str) -> int:
+    """Line of the record at content[start]'s own '"key":', or 1 if absent."""
+    offset = object_key_offsets(content, start).get(key)
+    return content.count('\n', 0, offset) + 1 if offset is not None else 1
 
 
 def replace_match(m: re.Match) -> str:
@@ -114,10 +151,6 @@ def value_match_snippet(value: str, context: int = 40) -> str:
     return snippet
 
 
-def preview_after(text: str) -> str:
-    return PATTERN.sub(replace_match, text)
-
-
 def prompt_yes_no(question: str) -> bool:
     while True:
         ans = input(f'{question} [y/n/q]: ').strip().lower()
@@ -137,7 +170,7 @@ def process_file(path: str, mode: str, fields_to_use) -> Tuple[int, int]:
     mode: 'interactive' | 'count' | 'yes'
     Returns (replacements_in_file, fields_changed)
     """
-    data, content = read_json_file(path)
+    data, content, spans = read_json_file(path, require=ANY_ABBR)
     if data is None:
         return 0, 0
 
@@ -146,27 +179,28 @@ def process_file(path: str, mode: str, fields_to_use) -> Tuple[int, int]:
     file_repl = 0
     fields_changed = 0
 
-    def handle_field(obj: Dict, key: str):
+    def handle_field(obj: Dict, key: str, start: int):
         nonlocal changed, file_repl, fields_changed
-        val = obj.get(key)
-        if not isinstance(val, str):
+        if key not in obj:
             return
-        if not PATTERN.search(val):
+        val = obj[key]
+        if not isinstance(val, str):
             return
 
-        # Count how many would change
-        _, cnt_preview = PATTERN.subn(replace_match, val)
+        # One pass: the substituted value doubles as the count and the preview
+        new_val, cnt = PATTERN.subn(replace_match, val)
+        if cnt == 0:
+            return
 
         if mode == 'count':
-            print(f'{name}:{key}: {cnt_preview}')
-            file_repl += cnt_preview
-            if cnt_preview > 0:
-                fields_changed += 1
+            print(f'{name}:{key}: {cnt}')
+            file_repl += cnt
+            fields_changed += 1
             return
 
-        line = find_line_number_for_field(content, key, val)
-
         if mode == 'interactive':
+            # Located inside this record's own span, so nested objects reusing key cannot shift it
+            line = key_line(content, start, key)
             print(SEPARATOR)
             print(f'file  : {name}:{line}')
             print(f'field : {key}')
@@ -174,36 +208,33 @@ def process_file(path: str, mode: str, fields_to_use) -> Tuple[int, int]:
             print(f'    {value_match_snippet(val)}')
             print()
             print('after:')
-            print(f'    {preview_after(val)}')
+            print(f'    {new_val}')
             print(f'code  : code -g {name}:{line}')
 
             if prompt_yes_no('Apply replacements in this field?'):
-                new_val, cnt = PATTERN.subn(replace_match, val)
-                if cnt > 0:
-                    obj[key] = new_val
-                    changed = True
-                    file_repl += cnt
-                    fields_changed += 1
-                    print(f'Applied {cnt} replacement(s) in {key}.')
-            return
-
-        if mode == 'yes':
-            new_val, cnt = PATTERN.subn(replace_match, val)
-            if cnt > 0:
                 obj[key] = new_val
                 changed = True
                 file_repl += cnt
                 fields_changed += 1
+                print(f'Applied {cnt} replacement(s) in {key}.')
+            return
+
+        if mode == 'yes':
+            obj[key] = new_val
+            changed = True
+            file_repl += cnt
+            fields_changed += 1
             return
 
     if isinstance(data, list):
-        for item in data:
+        for item, (start, _) in zip(data, spans):
             if isinstance(item, Dict):
                 for f in fields_to_use:
-                    handle_field(item, f)
+                    handle_field(item, f, start)
     elif isinstance(data, Dict):
+        start = len(content) - len(content.lstrip(' \t\n\r'))
         for f in fields_to_use:
-            handle_field(data, f)
+            handle_field(data, f, start)
 
     if changed and mode in ('interactive', 'yes'):
         shutil.copy2(path, path + '.bak')
@@ -232,7 +263,7 @@ def main():
     )
     args = ap.parse_args()
 
-    fields_to_use = args.fields
+    fields_to_use = list(dict.fromkeys(args.fields))
 
     base = script_dir()
     any_json = False
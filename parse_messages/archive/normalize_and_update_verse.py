@@ -1,14 +1,26 @@
 #!/usr/bin/env python3
 import argparse
 import json
+import mmap
+import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+from file_utils import write_bytes_atomic
+
+try:
+    import orjson
+except ImportError:  # optional; falls back to the stdlib json module
+    orjson = None
 
 # --------------- Configuration ---------------
 
 VERSE_FIELD = 'verse'
+MMAP_MIN_SIZE = 64 * 1024  # smaller files are cheaper to read than to map
 
 # Known book name fixes (case-insensitive keys)
 BOOK_FIXES = {
@@ -57,14 +69,20 @@ REF_SPLIT_RE = re.compile(r'\s*,\s*')  # split comma-separated verse tokens
 PART_SUFFIX_RE = re.compile(r'^(\d+)([abc])$', re.IGNORECASE)
 BOOK_CHAPTER_RE = re.compile(r'^\s*(?P<book>[\dA-Za-z ]+?)\s+(?P<chapter>\d+):(?P<rest>.+?)\s*$')
 TRAILING_JUNK_RE = re.compile(r"""[\'\"\.\s]+$""")  # strip trailing quotes/periods/spaces per token
+# Well-formed token in one match: verse or range, optional a/b/c suffixes, trailing junk
+VERSE_TOKEN_RE = re.compile(r"""\s*([0-9]+)[abcABC]?(?:\s*-\s*([0-9]+)[abcABC]?)?[\'\"\.\s]*""")
+# Output shape of normalize_reference: numbers without leading zeros, single spaces, no suffixes
+_NUM = r'(?:0|[1-9][0-9]*)'
+_RANGE = rf'{_NUM}(?:-{_NUM})?'
+CANONICAL_REF_RE = re.compile(rf'((?:[1-3] )?[A-Z][a-z]+(?: of [A-Z][a-z]+)*) {_NUM}:{_RANGE}(?:,{_RANGE})*')
 
 # --------------- Normalization core ---------------
 
 
 def fix_book_name(raw_book: str) -> str:
-    s = ' '.join(raw_book.split()).strip()
-    key = s.lower()
-    return BOOK_FIXES.get(key, s)
+    # split/join already trims and collapses whitespace; one dict probe on the whole name
+    s = ' '.join(raw_book.split())
+    return BOOK_FIXES.get(s.lower(), s)
 
 
 def strip_part_suffix(token: str) -> str:
@@ -76,6 +94,14 @@ def strip_part_suffix(token: str) -> str:
 
 
 def clean_token_strip_abc(token: str) -> str:
+    m = VERSE_TOKEN_RE.fullmatch(token)
+    if m:
+        start, end = m.groups()
+        if end is None:
+            return str(int(start))
+        if int(start) <= int(end):
+            return f'{int(start)}-{int(end)}'
+    # Anything else, including every error, takes the step-by-step path below
     t = TRAILING_JUNK_RE.sub('', token.strip())
     if not t:
         raise ValueError(f'Empty verse token after cleaning from {token!r}')
@@ -97,12 +123,28 @@ def clean_token_strip_abc(token: str) -> str:
         return str(int(v))
 
 
+def is_canonical_reference(s: str) -> bool:
+    """True when normalize_reference would return s unchanged."""
+    m = CANONICAL_REF_RE.fullmatch(s)
+    if not m or m.group(1).lower() in BOOK_FIXES:
+        return False
+    for tok in s.rpartition(':')[2].split(','):
+        a, _, b = tok.partition('-')
+        if b and int(a) > int(b):
+            return False
+    return True
+
+
+@lru_cache(maxsize=16384)
 def normalize_reference(ref_line: str) -> str:
+    # The corpus repeats a few hundred references; invalid ones raise and are not cached
     if ref_line is None:
         raise ValueError('Reference is None')
     s = ref_line.strip().strip('"').strip("'").strip()
     if not s:
         raise ValueError('Reference is empty')
+    if is_canonical_reference(s):
+        return s
 
     m = BOOK_CHAPTER_RE.match(s)
     if not m:
@@ -125,17 +167,156 @@ def normalize_reference(ref_line: str) -> str:
 # --------------- File processing ---------------
 
 
+def read_json(path: Path) -> Any:
+    # With orjson, large files are parsed straight from a read-only mmap
+    # rather than from a full bytes copy
+    if not orjson:
+        return json.loads(path.read_bytes())
+    with path.open('rb') as f:
+        if os.fstat(f.fileno()).st_size < MMAP_MIN_SIZE:
+            return orjson.loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return orjson.loads(view)
+
+
 def load_json_records(data: Any, filename: Path):
-    if isinstance(data, list):
+    # Parsed JSON only ever holds plain list/dict, so exact type checks suffice
+    t = type(data)
+    if t is list:
         return data, None, None
-    if isinstance(data, dict):
-        list_keys = [k for k, v in data.items() if isinstance(v, list)]
+    if t is dict:
+        list_keys = [k for k, v in data.items() if type(v) is list]
         if len(list_keys) == 1:
-            return data[list_keys[0]], data, list_keys[0]
+            key = list_keys[0]
+            return data[key], data, key
         raise ValueError(f'{filename}: expected a list or a dict with a single list of records')
     raise ValueError(f'{filename}: unsupported JSON structure')
 
 
+def report_text(lines: List[str]) -> str:
+    """Report lines as printed output."""
+    return ''.join(line + '\n' for line in lines)
+
+
+def process_one(
+    file_arg: str, preview: bool, continue_on_error: bool, compact: bool = False
+) -> Tuple[int, Optional[bytes], str]:
+    """
+    Normalize one file. Returns (exit_code, payload, report): a non-zero
+    exit_code means stop here, payload is the serialized output to write
+    back (None in preview mode) and report is the error/preview text to
+    print. Nothing is written or printed here, so the caller keeps both in
+    file order.
+    """
+    path = Path(file_arg)
+    lines: List[str] = []
+    if not path.exists():
+        lines.append(f'[ERROR] Not found: {path}')
+        return 2, None, report_text(lines)
+
+    try:
+        raw = read_json(path)
+        records, container, key = load_json_records(raw, path)
+    except Exception as e:
+        lines.append(f'[ERROR] {path}: cannot read/parse JSON: {e}')
+        return 2, None, report_text(lines)
+
+    preview_items: List[Tuple[int, Dict[str, str]]] = []
+    updated_records: List[Dict[str, Any]] = []
+
+    for idx, rec in enumerate(records, start=1):
+        if not isinstance(rec, dict):
+            updated_records.append(rec)
+            continue
+
+        rec_copy = dict(rec)
+        value = rec_copy.get(VERSE_FIELD)
+        if isinstance(value, str) and value.strip():
+            before = value
+            try:
+                after = normalize_reference(before)
+            except ValueError as e:
+                msg = f'{path}:{idx} invalid {VERSE_FIELD}: {e}'
+                if preview and not continue_on_error:
+                    lines.append(f'[ERROR] {msg}')
+                    return 2, None, report_text(lines)
+                else:
+                    lines.append(f'[ERROR] {msg}')
+                    if preview:
+                        preview_items.append((idx, {'error': str(e), 'before': before}))
+                    updated_records.append(rec_copy)
+                    continue
+
+            if before != after:
+                rec_copy[VERSE_FIELD] = after
+                if preview:
+                    preview_items.append((idx, {'before': before, 'after': after}))
+            # else: already normalized — do not add to preview
+        else:
+            # no verse or empty; keep silent in preview
+            pass
+
+        updated_records.append(rec_copy)
+
+    if preview:
+        if preview_items:
+            lines.append(f'\n=== Preview: {path} ===')
+            sep = '=' * 50
+            for idx, info in preview_items:
+                lines.append(sep)
+                lines.append(f'Record {idx}:')
+                # show before/after or error
+                if 'error' in info:
+                    lines.append(f'- error: {info["error"]}')
+                    if 'before' in info:
+                        lines.append(f'- before: {info["before"]}')
+                else:
+                    lines.append(f'- before: {info["before"]}')
+                    lines.append(f'- after : {info["after"]}')
+            lines.append(sep)
+        # If nothing to change and no errors, print nothing
+        return 0, None, report_text(lines)
+
+    try:
+        if container is None:
+            out = updated_records
+        else:
+            container[key] = updated_records
+            out = container
+        if orjson:
+            return 0, orjson.dumps(out, option=0 if compact else orjson.OPT_INDENT_2), report_text(lines)
+        if compact:
+            return 0, json.dumps(out, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), report_text(lines)
+        return 0, json.dumps(out, ensure_ascii=False, indent=2).encode('utf-8'), report_text(lines)
+    except Exception as e:
+        lines.append(f'[ERROR] {path}: failed to write output: {e}')
+        return 2, None, report_text(lines)
+
+
+def run_files(files: List[str], preview: bool, continue_on_error: bool, workers: int, compact: bool = False):
+    """
+    Yield (file_arg, exit_code, payload) in file order. The report from
+    process_one is printed before its result is yielded. More than one
+    file and worker fans the parsing/normalizing out to a process pool.
+    """
+    if workers <= 1 or len(files) < 2:
+        for file_arg in files:
+            code, payload, report = process_one(file_arg, preview, continue_on_error, compact)
+            sys.stdout.write(report)
+            yield file_arg, code, payload
+        return
+    n = len(files)
+    ex = ProcessPoolExecutor(max_workers=workers)
+    try:
+        results = ex.map(process_one, files, [preview] * n, [continue_on_error] * n, [compact] * n, chunksize=4)
+        for file_arg, (code, payload, report) in zip(files, results):
+            sys.stdout.write(report)
+            yield file_arg, code, payload
+    finally:
+        # Closed early (a failing file): drop the queued files instead of finishing them
+        ex.shutdown(cancel_futures=True)
+
+
 def main():
     parser = argparse.ArgumentParser(description='Normalize and overwrite the "verse" field in JSON files.')
     parser.add_argument('files', nargs='+', help='One or more JSON files (e.g., *.json)')
@@ -149,89 +330,41 @@ def main():
         action='store_true',
         help='In preview, log errors but continue.',
     )
+    parser.add_argument(
+        '--compact',
+        action='store_true',
+        help='Write compact JSON without indentation.',
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Worker processes (default: CPU count; 1 disables the pool)',
+    )
     args = parser.parse_args()
 
-    for file_arg in args.files:
-        path = Path(file_arg)
-        if not path.exists():
-            print(f'[ERROR] Not found: {path}')
-            sys.exit(2)
-
-        try:
-            raw = json.loads(path.read_text(encoding='utf-8'))
-            records, container, key = load_json_records(raw, path)
-        except Exception as e:
-            print(f'[ERROR] {path}: cannot read/parse JSON: {e}')
-            sys.exit(2)
-
-        preview_items: List[Tuple[int, Dict[str, str]]] = []
-        updated_records: List[Dict[str, Any]] = []
-
-        for idx, rec in enumerate(records, start=1):
-            if not isinstance(rec, dict):
-                updated_records.append(rec)
-                continue
-
-            rec_copy = dict(rec)
-            value = rec_copy.get(VERSE_FIELD)
-            if isinstance(value, str) and value.strip():
-                before = value
-                try:
-                    after = normalize_reference(before)
-                except ValueError as e:
-                    msg = f'{path}:{idx} invalid {VERSE_FIELD}: {e}'
-                    if args.preview and not args.continue_on_error:
-                        print(f'[ERROR] {msg}')
-                        sys.exit(2)
-                    else:
-                        print(f'[ERROR] {msg}')
-                        if args.preview:
-                            preview_items.append((idx, {'error': str(e), 'before': before}))
-                        updated_records.append(rec_copy)
-                        continue
-
-                if before != after:
-                    rec_copy[VERSE_FIELD] = after
-                    if args.preview:
-                        preview_items.append((idx, {'before': before, 'after': after}))
-                # else: already normalized — do not add to preview
-            else:
-                # no verse or empty; keep silent in preview
-                pass
-
-            updated_records.append(rec_copy)
-
-        if args.preview:
-            if preview_items:
-                print(f'\n=== Preview: {path} ===')
-                sep = '=' * 50
-                for idx, info in preview_items:
-                    print(sep)
-                    print(f'Record {idx}:')
-                    # show before/after or error
-                    if 'error' in info:
-                        print(f'- error: {info["error"]}')
-                        if 'before' in info:
-                            print(f'- before: {info["before"]}')
-                    else:
-                        print(f'- before: {info["before"]}')
-                        print(f'- after : {info["after"]}')
-                print(sep)
-            # If nothing to change and no errors, print nothing
+    # Files are still written and failures still stop the run strictly in
+    # argument order; workers only parse, normalize and serialize
+    exit_code = 0
+    results = run_files(args.files, args.preview, args.continue_on_error, args.workers, args.compact)
+    for file_arg, code, payload in results:
+        if code:
+            exit_code = code
+            break
+        if payload is None:
             continue
-
-        # Write back (non-preview)
+        path = Path(file_arg)
         try:
-            if container is None:
-                out = updated_records
-            else:
-                container[key] = updated_records
-                out = container
-            path.write_text(json.dumps(out, ensure_ascii=False, indent=2), encoding='utf-8')
+            write_bytes_atomic(path, payload)
             print(f'[OK] Updated: {path}')
         except Exception as e:
             print(f'[ERROR] {path}: failed to write output: {e}')
-            sys.exit(2)
+            exit_code = 2
+            break
+    # Shut the pool down (cancelling queued files) before exiting
+    results.close()
+    if exit_code:
+        sys.exit(exit_code)
 
 
 if __name__ == '__main__':
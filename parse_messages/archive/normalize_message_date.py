@@ -2,12 +2,39 @@
 import argparse
 import glob
 import json
-from datetime import datetime, timezone
+import mmap
+import os
+import re
+import shutil
+import stat
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timezone
 from email.utils import parsedate_to_datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from file_utils import write_bytes_atomic
+
+try:
+    import orjson
+except ImportError:  # optional; falls back to the stdlib json module
+    orjson = None
 
 Record = Dict[str, Any]
+MMAP_MIN_SIZE = 64 * 1024  # smaller files are cheaper to read than to map
+
+# Fast paths for the two shapes the corpus actually stores. Both are strict
+# subsets of what the generic parsers accept, so a miss just falls through.
+ISO_DATE_PREFIX_RE = re.compile(r'([0-9]{4})-(0[1-9]|1[0-2])-(0[1-9]|[12][0-9]|3[01])')
+RFC2822_DATE_RE = re.compile(
+    r'[A-Za-z]{3}, ([0-9]{1,2}) ([A-Za-z]{3}) ([1-9][0-9]{3}) ([0-9]{2}):([0-9]{2})(?::([0-9]{2}))? ([+-])([0-9]{2})([0-9]{2})'
+)
+RFC_MONTHS = {
+    name: i
+    for i, name in enumerate(['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], 1)
+}
 
 
 def try_parse_iso(s: str) -> Optional[datetime]:
@@ -31,14 +58,14 @@ def try_parse_iso(s: str) -> Optional[datetime]:
     return None
 
 
-def try_parse_rfc2822(s: str) -> Optional[datetime]:
+def try_rfc2822_ymd(s: str) -> Optional[str]:
     """
-    Parse RFC 2822 / email-style dates:
+    Parse RFC 2822 / email-style dates and return YYYY-MM-DD:
     Example: Tue, 16 Jul 2019 19:05:51 -0500
+    Only non-standard shapes get here; try_fast_date handles the usual one.
     """
     try:
-        dt = parsedate_to_datetime(s)
-        return dt
+        return parsedate_to_datetime(s).date().isoformat()
     except Exception:
         return None
 
@@ -60,6 +87,34 @@ def try_parse_common_patterns(s: str) -> Optional[datetime]:
     return None
 
 
+def try_fast_date(s: str) -> Optional[str]:
+    """
+    YYYY-MM-DD for a plain ISO date prefix or a standard RFC 2822 timestamp,
+    without strptime or email.utils. None means "not handled here".
+    """
+    m = ISO_DATE_PREFIX_RE.match(s)
+    if m:
+        try:
+            date(int(m[1]), int(m[2]), int(m[3]))
+        except ValueError:
+            return None
+        return m[0]
+    m = RFC2822_DATE_RE.fullmatch(s)
+    if m:
+        month = RFC_MONTHS.get(m[2].lower())
+        # parsedate_to_datetime rejects offsets of a day or more
+        if month is None or int(m[8]) * 3600 + int(m[9]) * 60 >= 86400:
+            return None
+        # The time only has to be valid; the date is formatted directly
+        if int(m[4]) > 23 or int(m[5]) > 59 or int(m[6] or 0) > 59:
+            return None
+        try:
+            return date(int(m[3]), month, int(m[1])).isoformat()
+        except ValueError:
+            return None
+    return None
+
+
 def parse_to_yyyy_mm_dd(value: Any) -> Optional[str]:
     """
     Parse many common UTC/offset datetime formats and return YYYY-MM-DD.
@@ -72,8 +127,17 @@ def parse_to_yyyy_mm_dd(value: Any) -> Optional[str]:
     s = str(value).strip()
     if not s:
         return None
+    return _parse_date_string(s)
 
-    # Fast path: if it already looks like YYYY-MM-DD at the start, validate and return
+
+@lru_cache(maxsize=16384)
+def _parse_date_string(s: str) -> Optional[str]:
+    # date_utc values repeat heavily within and across files; parse each once
+    ymd = try_fast_date(s)
+    if ymd:
+        return ymd
+
+    # Looser YYYY-MM-DD prefix check (strptime also takes e.g. a space-padded day)
     if len(s) >= 10 and s[4] == '-' and s[7] == '-':
         ymd = s[:10]
         try:
@@ -88,9 +152,9 @@ def parse_to_yyyy_mm_dd(value: Any) -> Optional[str]:
         return dt.date().isoformat()
 
     # RFC 2822 attempts
-    dt = try_parse_rfc2822(s)
-    if dt is not None:
-        return dt.date().isoformat()
+    ymd = try_rfc2822_ymd(s)
+    if ymd is not None:
+        return ymd
 
     # Common patterns without offset
     dt = try_parse_common_patterns(s)
@@ -104,47 +168,62 @@ def parse_to_yyyy_mm_dd(value: Any) -> Optional[str]:
     return None
 
 
-def load_records(path: Path) -> Optional[Union[Record, List[Record]]]:
-    try:
-        with path.open('r', encoding='utf-8') as f:
-            return json.load(f)
-    except json.JSONDecodeError as e:
-        print(f'[WARN] Skipping invalid JSON: {path} ({e})')
-        return None
+def load_records(path: Path) -> Union[Record, List[Record]]:
+    """Parse a JSON file; raises json.JSONDecodeError (orjson's subclasses it) on invalid JSON."""
+    if orjson:
+        # Large files are parsed straight from a read-only mmap, without a bytes copy
+        with path.open('rb') as f:
+            if os.fstat(f.fileno()).st_size < MMAP_MIN_SIZE:
+                return orjson.loads(f.read())
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return orjson.loads(view)
+    with path.open('r', encoding='utf-8') as f:
+        return json.load(f)
 
 
-def write_records(path: Path, data: Union[Record, List[Record]]) -> None:
-    tmp = path.with_suffix(path.suffix + '.tmp')
+def write_records(path: Path, data: Union[Record, List[Record]], compact: bool = False) -> None:
     bak = path.with_suffix(path.suffix + '.bak')
 
-    with tmp.open('w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-        f.write('\n')
+    if orjson:
+        payload = orjson.dumps(data, option=0 if compact else orjson.OPT_INDENT_2) + b'\n'
+    elif compact:
+        payload = (json.dumps(data, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+    else:
+        payload = (json.dumps(data, ensure_ascii=False, indent=2) + '\n').encode('utf-8')
 
     if not bak.exists():
-        path.replace(bak)
-    else:
-        path.unlink(missing_ok=True)
-    tmp.replace(path)
+        # The rewrite below swaps in a new inode, so a hard link keeps the
+        # original file as the backup; copy it where links are unsupported
+        try:
+            os.link(path, bak)
+        except OSError:
+            shutil.copy2(path, bak)
+    write_bytes_atomic(path, payload)
 
 
-def process_file(path: Path, preview: bool) -> int:
-    data = load_records(path)
-    if data is None:
-        return 0
+def process_file(path: Path, preview: bool, compact: bool = False) -> Tuple[int, str]:
+    """
+    Update msg_date in one file. Returns (update count, report), where the
+    report is the warning/preview text to print for the file.
+    """
+    try:
+        data = load_records(path)
+    except json.JSONDecodeError as e:
+        return 0, f'[WARN] Skipping invalid JSON: {path} ({e})\n'
 
-    if isinstance(data, dict):
+    t = type(data)  # parsed JSON: plain dict/list only
+    if t is dict:
         recs = [data]
         is_list = False
-    elif isinstance(data, list):
-        recs = [r for r in data if isinstance(r, dict)]
+    elif t is list:
+        recs = [r for r in data if type(r) is dict]
         is_list = True
     else:
-        print(f'[WARN] Unsupported JSON structure in {path}; expected object or list.')
-        return 0
+        return 0, f'[WARN] Unsupported JSON structure in {path}; expected object or list.\n'
 
     updates = 0
     changes: List[str] = []
+    lines: List[str] = []
 
     for idx, rec in enumerate(recs):
         raw = rec.get('date_utc')
@@ -163,34 +242,95 @@ def process_file(path: Path, preview: bool) -> int:
             else:
                 if 'msg_date' in rec:
                     del rec['msg_date']
-                print(f'[WARN] Could not parse date_utc to msg_date in {path}: {raw!r}')
+                lines.append(f'[WARN] Could not parse date_utc to msg_date in {path}: {raw!r}')
 
     if preview:
         if updates > 0 or changes:
-            print(f'[PREVIEW] {path}: {updates} update(s)')
-            for line in changes:
-                print(line)
+            lines.append(f'[PREVIEW] {path}: {updates} update(s)')
+            lines.extend(changes)
     else:
         if updates > 0:
             out = recs if is_list else recs[0]
-            write_records(path, out)
+            write_records(path, out, compact)
+
+    return updates, ''.join(line + '\n' for line in lines)
 
-    return updates
+
+def process_files(paths: List[Path], preview: bool, workers: int, compact: bool = False):
+    """
+    Yield process_file update counts in path order, fanning out to a process
+    pool when there is more than one file and more than one worker. The
+    report for each file is printed before its count is yielded.
+    """
+    if workers <= 1 or len(paths) < 2:
+        for path in paths:
+            updates, report = process_file(path, preview, compact)
+            sys.stdout.write(report)
+            yield updates
+        return
+    n = len(paths)
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        for updates, report in ex.map(process_file, paths, [preview] * n, [compact] * n, chunksize=4):
+            sys.stdout.write(report)
+            yield updates
+
+
+def _split_json_glob(pattern: str) -> Optional[Tuple[str, bool]]:
+    """
+    (root, recursive) when pattern is a literal directory followed by
+    *.json or **/*.json, the shapes _walk_json serves; otherwise None.
+    """
+    for tail, recursive in (('**/*.json', True), ('*.json', False)):
+        if pattern == tail:
+            root = ''
+        elif pattern.endswith('/' + tail):
+            root = pattern[: -len(tail) - 1]
+        else:
+            continue
+        return None if glob.has_magic(root) else (root, recursive)
+    return None
+
+
+def _walk_json(root: str, recursive: bool) -> Iterator[str]:
+    """
+    Yield the same paths, in the same order, as glob.glob on root/*.json
+    (or root/**/*.json when recursive), but list each directory only once:
+    non-hidden *.json names, directory by directory in pre-order.
+    """
+    stack = [root]
+    while stack:
+        d = stack.pop()
+        try:
+            with os.scandir(d or '.') as it:
+                entries = [e for e in it if not e.name.startswith('.')]
+            subdirs = [e.name for e in entries if e.is_dir()] if recursive else []
+        except OSError:
+            continue
+        for e in entries:
+            if e.name.endswith('.json'):
+                yield os.path.join(d, e.name)
+        stack.extend(os.path.join(d, name) for name in reversed(subdirs))
 
 
 def expand_globs(patterns: List[str]) -> List[Path]:
     files: List[str] = []
     for pat in patterns:
-        files.extend(glob.glob(pat, recursive=True))
+        split = _split_json_glob(pat)
+        files.extend(_walk_json(*split) if split else glob.glob(pat, recursive=True))
     paths: List[Path] = []
     seen = set()
     for f in files:
-        p = Path(f)
-        if p.is_file() and p.suffix.lower() == '.json':
-            rp = p.resolve()
-            if rp not in seen:
-                seen.add(rp)
-                paths.append(p)
+        if not f.lower().endswith('.json'):
+            continue
+        # One stat per candidate: regular-file check plus (device, inode) dedupe
+        try:
+            st = os.stat(f)
+        except OSError:
+            continue
+        key = (st.st_dev, st.st_ino)
+        if stat.S_ISREG(st.st_mode) and key not in seen:
+            seen.add(key)
+            paths.append(Path(f))
     return paths
 
 
@@ -206,6 +346,17 @@ def main():
         nargs='+',
         help="Glob patterns, e.g., './data/*.json' './data/**/*.json'",
     )
+    ap.add_argument(
+        '--compact',
+        action='store_true',
+        help='Write compact JSON without indentation (the .bak keeps the original file)',
+    )
+    ap.add_argument(
+        '--workers',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Worker processes (default: CPU count; 1 disables the pool)',
+    )
     args = ap.parse_args()
 
     paths = expand_globs(args.globs)
@@ -215,9 +366,9 @@ def main():
 
     total_files = 0
     total_updates = 0
-    for path in paths:
+    for updates in process_files(paths, args.preview, args.workers, args.compact):
         total_files += 1
-        total_updates += process_file(path, preview=args.preview)
+        total_updates += updates
 
     if args.preview:
         print(f'Preview complete. Files examined: {total_files}, records needing update: {total_updates}')
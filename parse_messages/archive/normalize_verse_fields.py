@@ -1,54 +1,80 @@
 #!/usr/bin/env python3
 import argparse
 import json
+import mmap
 import os
 import re
+import shutil
 import sys
 import time
-from typing import Any, List
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from file_utils import write_bytes_atomic
+
+try:
+    import orjson
+except ImportError:  # optional; falls back to the stdlib json module
+    orjson = None
 
 COLON_SPACE_RE = re.compile(r':\s+([0-9])')
+DASH_TABLE = str.maketrans('–—', '--')  # en/em dash -> hyphen in one pass
+MMAP_MIN_SIZE = 64 * 1024  # smaller files are cheaper to read than to map
 
 
 def normalize_verse(s: str) -> str:
     if not isinstance(s, str):
         return s
+    # Already-clean verses are the norm: each step only runs when its input is
+    # present, so a clean value comes back untouched without a regex pass
     out = s.strip()
-    out = out.replace('–', '-').replace('—', '-')
-    out = COLON_SPACE_RE.sub(r':\1', out)
+    if '–' in out or '—' in out:
+        out = out.translate(DASH_TABLE)
+    if ':' in out:
+        out = COLON_SPACE_RE.sub(r':\1', out)
     return out
 
 
-def fix_verse_fields(node: Any, changes: List[str], file_base: str, path_stack: List[str]) -> bool:
+def fix_verse_fields(
+    node: Any, changes: List[str], file_base: str, path_stack: List[str], memo: Optional[Dict[str, str]] = None
+) -> bool:
     """
-    Recursively walk JSON and normalize only values where key == 'verse'.
+    Walk JSON and normalize only values where key == 'verse'.
     Track a human-readable path for preview output.
+    memo maps each verse string seen so far to its normalized form, so
+    repeated verses are normalized once and share one result string.
     Returns True if any change occurred.
     """
+    if not isinstance(node, (dict, list)):
+        return False
+    if memo is None:
+        memo = {}
     changed = False
-    if isinstance(node, dict):
-        for k, v in list(node.items()):
-            path_stack.append(k)
-            if k == 'verse' and isinstance(v, str):
-                new_v = normalize_verse(v)
+    # Explicit stack of (items iterator, path, owning dict or None) frames;
+    # descending on each container keeps the recursive pre-order
+    stack = [(iter(node.items()) if isinstance(node, dict) else enumerate(node), tuple(path_stack), node)]
+    while stack:
+        items, path, owner = stack[-1]
+        is_dict = isinstance(owner, dict)
+        for k, v in items:
+            if is_dict and k == 'verse' and isinstance(v, str):
+                new_v = memo.get(v)
+                if new_v is None:
+                    new_v = memo[v] = normalize_verse(v)
                 if new_v != v:
-                    node[k] = new_v
+                    owner[k] = new_v
                     # build a location string like object.nested[3].verse
-                    loc = '.'.join(path_stack)
+                    loc = '.'.join(path + (k,))
                     changes.append(f'{file_base}:{loc}\n    - from: {v}\n    + to:   {new_v}')
                     changed = True
-            else:
-                if isinstance(v, (dict, list)):
-                    if fix_verse_fields(v, changes, file_base, path_stack):
-                        changed = True
-            path_stack.pop()
-    elif isinstance(node, list):
-        for i, v in enumerate(node):
-            path_stack.append(f'[{i}]')
-            if isinstance(v, (dict, list)):
-                if fix_verse_fields(v, changes, file_base, path_stack):
-                    changed = True
-            path_stack.pop()
+            elif isinstance(v, dict):
+                stack.append((iter(v.items()), path + ((k if is_dict else f'[{k}]'),), v))
+                break
+            elif isinstance(v, list):
+                stack.append((enumerate(v), path + ((k if is_dict else f'[{k}]'),), v))
+                break
+        else:
+            stack.pop()
     return changed
 
 
@@ -57,16 +83,27 @@ def backup_path(path: str) -> str:
     return f'{path}.bak.{ts}'
 
 
-def process_file(path: str, preview: bool = False, no_backup: bool = False) -> str:
+def process_file(path: str, preview: bool = False, no_backup: bool = False, compact: bool = False) -> str:
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            doc = json.load(f)
+        if orjson:
+            # Parse large files straight from a read-only mmap so no bytes copy of
+            # the file is held alongside the parsed document
+            with open(path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size < MMAP_MIN_SIZE:
+                    doc = orjson.loads(f.read())
+                else:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                        doc = orjson.loads(view)
+        else:
+            with open(path, 'rb') as f:
+                doc = json.loads(f.read())
     except Exception as e:
         return f'[ERROR] Read failed {path}: {e}'
 
     base = os.path.basename(path)
     changes: List[str] = []
-    changed = fix_verse_fields(doc, changes, base, [])
+    memo: Dict[str, str] = {}
+    changed = fix_verse_fields(doc, changes, base, [], memo)
 
     if not changed:
         return f'[SKIP] No verse changes: {path}'
@@ -76,14 +113,22 @@ def process_file(path: str, preview: bool = False, no_backup: bool = False) -> s
         return header + ('\n' + '\n'.join(changes) if changes else '')
 
     try:
+        if orjson:
+            payload = orjson.dumps(doc, option=0 if compact else orjson.OPT_INDENT_2) + b'\n'
+        elif compact:
+            payload = (json.dumps(doc, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+        else:
+            payload = (json.dumps(doc, ensure_ascii=False, indent=2) + '\n').encode('utf-8')
         if not no_backup:
+            # The rewrite below swaps in a new inode, so a hard link keeps the
+            # original file as the backup; copy it where links are unsupported
             bp = backup_path(path)
-            with open(bp, 'w', encoding='utf-8') as bf:
-                json.dump(doc, bf, ensure_ascii=False, indent=2)
-                bf.write('\n')
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(doc, f, ensure_ascii=False, indent=2)
-            f.write('\n')
+            try:
+                os.link(path, bp)
+            except OSError:
+                shutil.copyfile(path, bp)
+        # Temp file + rename, so a crash mid-write never truncates the source
+        write_bytes_atomic(path, payload)
         return f'[OK] Updated {path} ({len(changes)} change(s))'
     except Exception as e:
         return f'[ERROR] Write failed {path}: {e}'
@@ -103,6 +148,20 @@ def find_json_files(paths: List[str]) -> List[str]:
     return sorted(files)
 
 
+def process_files(files: List[str], preview: bool, no_backup: bool, workers: int, compact: bool = False):
+    """
+    Yield process_file messages in file order, using a process pool when
+    there is more than one file and more than one worker.
+    """
+    if workers <= 1 or len(files) < 2:
+        for fp in files:
+            yield process_file(fp, preview=preview, no_backup=no_backup, compact=compact)
+        return
+    n = len(files)
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        yield from ex.map(process_file, files, [preview] * n, [no_backup] * n, [compact] * n, chunksize=4)
+
+
 def main():
     ap = argparse.ArgumentParser(
         description='Normalize only "verse" fields in JSON: trim, remove space after colon, replace en/em dashes.'
@@ -118,6 +177,17 @@ def main():
         action='store_true',
         help='Do not create .bak timestamped backups',
     )
+    ap.add_argument(
+        '--compact',
+        action='store_true',
+        help='Write compact JSON without indentation (.bak backups keep the original file)',
+    )
+    ap.add_argument(
+        '--workers',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Worker processes (default: CPU count; 1 disables the pool)',
+    )
     args = ap.parse_args()
 
     files = find_json_files(args.paths)
@@ -125,8 +195,8 @@ def main():
         print('[INFO] No JSON files found.', file=sys.stderr)
         sys.exit(1)
 
-    for fp in files:
-        print(process_file(fp, preview=args.preview, no_backup=args.no_backup))
+    for msg in process_files(files, args.preview, args.no_backup, args.workers, args.compact):
+        print(msg)
 
 
 if __name__ == '__main__':
@@ -18,16 +18,34 @@ import os
 import sys
 import argparse
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Union
 import anthropic
 
-# Initialize Claude client
+from file_utils import write_bytes_atomic
+
+try:
+    import orjson
+except ImportError:  # optional; falls back to the stdlib json module
+    orjson = None
+
+# Initialize Claude client. The SDK retries rate limits (429), overload/server
+# errors (5xx), timeouts and dropped connections itself, with exponential
+# backoff and jitter that honors retry-after; allow more attempts than its
+# default of 2 since concurrent batches can trip the rate limit.
+API_MAX_RETRIES = 6
 client = anthropic.Anthropic(
     api_key=os.getenv('CLAUDE_API_KEY'),
+    max_retries=API_MAX_RETRIES,
 )
 
 CORRECTED_DIR = 'ai_corrected_reflections'
+DEFAULT_WORKERS = 16  # concurrent Claude API calls
+BATCH_MAX_REQUESTS = 10000  # requests per Message Batches submission
+BATCH_POLL_SECONDS = 30
+PARSED_NAME_RE = re.compile(r'^parsed_(\d+)\.json$')  # parsed_<nnnn>.json, renamed to <nnnn>.json
 
 # Markers we never want to appear in the output
 HEADER_MARKERS = (
@@ -81,33 +99,74 @@ def standardize_text_formatting(text: str) -> str:
     return text
 
 
+# In-process view of the cache directory: message_id -> get_cached_correction result.
+# save_correction keeps it current, so each cache file is read at most once per run.
+_CACHE: Dict[str, Tuple[Optional[str], bool]] = {}
+# message_id -> cache file, listed by a single scandir on first lookup
+_CACHE_FILES: Optional[Dict[str, os.DirEntry]] = None
+CACHE_SUFFIX = '_reflection.txt'
+NO_CHANGE_MARKER = 'okay'  # cache file content recording that no correction was needed
+
+
+def _cache_files() -> Dict[str, os.DirEntry]:
+    global _CACHE_FILES
+    if _CACHE_FILES is None:
+        try:
+            with os.scandir(CORRECTED_DIR) as it:
+                _CACHE_FILES = {e.name[: -len(CACHE_SUFFIX)]: e for e in it if e.name.endswith(CACHE_SUFFIX)}
+        except FileNotFoundError:
+            _CACHE_FILES = {}
+    return _CACHE_FILES
+
+
+def _cache_entry(content: str) -> Tuple[Optional[str], bool]:
+    content = content.strip()
+    if content == NO_CHANGE_MARKER:
+        return None, True  # No correction needed, but cache exists
+    return content, True  # Correction text, cache exists
+
+
 def get_cached_correction(message_id: str) -> Tuple[Optional[str], bool]:
     """Check if we already have a cached correction. Returns (correction_text, cache_exists)."""
-    cache_file = Path(CORRECTED_DIR) / f'{message_id}_reflection.txt'
-    if cache_file.exists():
-        with open(cache_file, 'r', encoding='utf-8') as f:
-            content = f.read().strip()
-            if content == 'okay':
-                return None, True  # No correction needed, but cache exists
-            else:
-                return content, True  # Correction text, cache exists
-    return None, False  # No cache
+    entry = _CACHE.get(message_id)
+    if entry is not None:
+        return entry
+    cache_file = _cache_files().get(message_id)
+    if cache_file is None:
+        entry = (None, False)  # No cache
+    elif cache_file.stat().st_size == 0:
+        entry = (None, False)  # Empty file is never a valid entry (e.g. an interrupted write): ask again
+    else:
+        with open(cache_file.path, 'r', encoding='utf-8') as f:
+            entry = _cache_entry(f.read())
+    _CACHE[message_id] = entry
+    return entry
 
 
 def save_correction(message_id: str, corrected_text: Optional[str]):
-    """Save the correction to cache file."""
+    """Save the correction to cache file; NO_CHANGE_MARKER records that none was needed."""
     Path(CORRECTED_DIR).mkdir(exist_ok=True)
-    cache_file = Path(CORRECTED_DIR) / f'{message_id}_reflection.txt'
-    content = corrected_text if corrected_text else 'okay'
-    with open(cache_file, 'w', encoding='utf-8') as f:
-        f.write(content)
+    cache_file = Path(CORRECTED_DIR) / f'{message_id}{CACHE_SUFFIX}'
+    content = corrected_text if corrected_text else NO_CHANGE_MARKER
+    # Raw fd writes (these files are tiny, so skip the buffered text-file layers) into a
+    # temp file that is swapped in whole, so a cut-short write never reads back as a correction
+    tmp = f'{cache_file}.tmp'
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        data = memoryview(content.encode('utf-8'))
+        while data:
+            data = data[os.write(fd, data) :]
+    finally:
+        os.close(fd)
+    os.replace(tmp, cache_file)
+    _CACHE[message_id] = _cache_entry(content)
 
 
 def get_renamed_filename(original_path: str) -> Optional[str]:
     """Get the new filename for renaming parsed_<nnnn>.json to <nnnn>.json"""
     filename = os.path.basename(original_path)
     dirname = os.path.dirname(original_path)
-    match = re.match(r'^parsed_(\d+)\.json$', filename)
+    match = PARSED_NAME_RE.match(filename)
     if match:
         number = match.group(1)
         new_filename = f'{number}.json'
@@ -170,8 +229,8 @@ def clean_claude_response(response_text: str, original_text: str) -> Optional[st
     return cleaned
 
 
-def correct_reflection_with_ai(reflection_text: str) -> Optional[str]:
-    """Use Claude AI to correct spelling, punctuation, and formatting errors."""
+def build_correction_params(reflection_text: str) -> Dict[str, Any]:
+    """Claude request parameters for correcting one reflection (used for single and batch calls)."""
     prompt = f"""Fix only spelling, punctuation, capitalization, and spacing errors in the text below.
 Do not add any headers, labels, or explanations. Output only the corrected text.
 Do NOT output strings like: CORRECTED_TEXT:, CORRECTIONS_NEEDED, Corrected:, Edited:, Result:.
@@ -181,39 +240,143 @@ If no corrections are needed, respond with exactly: NO_CHANGES_NEEDED
 Text:
 {reflection_text}"""
 
-    try:
-        response = client.messages.create(
-            model='claude-3-haiku-20240307',
-            max_tokens=2000,
-            temperature=0.1,
-            system='You are a proofreader. Output only the corrected text with no labels or commentary. Never add headers or markers.',
-            messages=[{'role': 'user', 'content': prompt}],
-        )
+    return {
+        'model': 'claude-3-haiku-20240307',
+        'max_tokens': 2000,
+        'temperature': 0.1,
+        'system': 'You are a proofreader. Output only the corrected text with no labels or commentary. Never add headers or markers.',
+        'messages': [{'role': 'user', 'content': prompt}],
+    }
 
-        raw_response = response.content[0].text.strip()
 
-        # Handle 'no changes' in a tolerant way
-        if re.search(r'\bno[_\s-]*changes[_\s-]*needed\b', raw_response, re.I):
-            return None
+def correction_from_response(message: Any, reflection_text: str) -> Optional[str]:
+    """Turn Claude's reply into the corrected text, or None when no correction is needed."""
+    raw_response = message.content[0].text.strip()
+
+    # Handle 'no changes' in a tolerant way
+    if re.search(r'\bno[_\s-]*changes[_\s-]*needed\b', raw_response, re.I):
+        return None
 
-        # Clean the response
-        cleaned_response = clean_claude_response(raw_response, reflection_text)
+    # Clean the response
+    cleaned_response = clean_claude_response(raw_response, reflection_text)
 
-        # Final guard: if any marker still appears, reject it as no-change
+    # Final guard: if any marker still appears, reject it as no-change
+    if cleaned_response and contains_marker(cleaned_response):
+        cleaned_response = clean_claude_response(cleaned_response, reflection_text)
         if cleaned_response and contains_marker(cleaned_response):
-            cleaned_response = clean_claude_response(cleaned_response, reflection_text)
-            if cleaned_response and contains_marker(cleaned_response):
-                return None
+            return None
+
+    return cleaned_response
 
-        return cleaned_response
 
+def correct_reflection_with_ai(reflection_text: str) -> Optional[str]:
+    """
+    Use Claude AI to correct spelling, punctuation, and formatting errors.
+    Returns None when no correction is needed. A failed call raises (after the
+    client's retries) so it is never cached as "no changes needed".
+    """
+    try:
+        response = client.messages.create(**build_correction_params(reflection_text))
+        return correction_from_response(response, reflection_text)
     except Exception as e:
         print(f'❌ Error calling Claude API for correction: {e}')
-        return None
+        raise
 
 
-def process_record(record: Dict[str, Any], preview_mode: bool = False) -> Tuple[Dict[str, Any], bool]:
-    """Process a single JSON record. Returns (updated_record, was_corrected)."""
+def collect_uncached(records: List[Dict[str, Any]], pending: Dict[str, str]):
+    """Add message_id -> reflection to pending for records with no cached correction yet."""
+    for record in records:
+        if not isinstance(record, dict) or 'message_id' not in record or not isinstance(record.get('reflection'), str):
+            continue
+        message_id = str(record['message_id'])
+        if message_id not in pending and not get_cached_correction(message_id)[1]:
+            pending[message_id] = record['reflection']
+
+
+def group_by_text(pending: Dict[str, str]) -> Dict[str, List[str]]:
+    """reflection text -> message_ids sharing it, so identical texts go to Claude once."""
+    groups: Dict[str, List[str]] = {}
+    for message_id, text in pending.items():
+        groups.setdefault(text, []).append(message_id)
+    return groups
+
+
+def prefetch_corrections(pending: Dict[str, str], workers: int) -> Dict[str, Union[Optional[str], Exception]]:
+    """
+    Ask Claude to correct every distinct pending reflection, up to `workers`
+    calls at a time (they are network-bound), caching each result for every
+    message that shares the text as soon as it arrives.
+    Returns message_id -> AI correction (None when no change is needed), or
+    the exception for a failed call, which is not cached.
+    """
+    results: Dict[str, Union[Optional[str], Exception]] = {}
+    if not pending:
+        return results
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as ex:
+        futures = {ex.submit(correct_reflection_with_ai, text): ids for text, ids in group_by_text(pending).items()}
+        for future in as_completed(futures):
+            message_ids = futures[future]
+            try:
+                correction = future.result()
+            except Exception as e:
+                results.update(dict.fromkeys(message_ids, e))
+                continue
+            for message_id in message_ids:
+                results[message_id] = correction
+                save_correction(message_id, correction)
+    return results
+
+
+def prefetch_corrections_batch(pending: Dict[str, str]) -> Dict[str, Union[Optional[str], Exception]]:
+    """
+    Same contract as prefetch_corrections, but submits the pending reflections
+    through the Message Batches API (about half the per-token cost) and polls
+    until each batch has ended. Results can take minutes or more to arrive.
+    """
+    results: Dict[str, Union[Optional[str], Exception]] = {}
+    items = list(group_by_text(pending).items())
+    for start in range(0, len(items), BATCH_MAX_REQUESTS):
+        chunk = items[start : start + BATCH_MAX_REQUESTS]
+        # custom_id only allows [A-Za-z0-9_-]{1,64}; index into the chunk instead of using message_id
+        batch = client.messages.batches.create(
+            requests=[
+                {'custom_id': f'r{i}', 'params': build_correction_params(text)} for i, (text, _) in enumerate(chunk)
+            ]
+        )
+        print(f'📦 Submitted batch {batch.id} with {len(chunk)} request(s); waiting for results...')
+        while batch.processing_status != 'ended':
+            time.sleep(BATCH_POLL_SECONDS)
+            batch = client.messages.batches.retrieve(batch.id)
+
+        for entry in client.messages.batches.results(batch.id):
+            text, message_ids = chunk[int(entry.custom_id[1:])]
+            label = ', '.join(message_ids)
+            if entry.result.type != 'succeeded':
+                print(f'❌ Batch request for message {label} {entry.result.type}')
+                results.update(dict.fromkeys(message_ids, RuntimeError(f'batch request {entry.result.type}')))
+                continue
+            try:
+                correction = correction_from_response(entry.result.message, text)
+            except Exception as e:
+                print(f'❌ Error reading batch result for message {label}: {e}')
+                results.update(dict.fromkeys(message_ids, e))
+                continue
+            for message_id in message_ids:
+                results[message_id] = correction
+                save_correction(message_id, correction)
+    return results
+
+
+def process_record(
+    record: Dict[str, Any],
+    preview_mode: bool = False,
+    prefetched: Optional[Dict[str, Union[Optional[str], Exception]]] = None,
+) -> Tuple[Dict[str, Any], bool]:
+    """
+    Process a single JSON record. Returns (updated_record, was_corrected).
+    A message_id found in prefetched is reported as a new AI result (and
+    removed, so later duplicates read it from the cache like before).
+    """
     try:
         message_id = get_message_id(record)
     except ValueError as e:
@@ -229,7 +392,11 @@ def process_record(record: Dict[str, Any], preview_mode: bool = False) -> Tuple[
     original_reflection = record['reflection']
 
     # Step 1: Check cache for AI correction first (before standardization)
-    cached_correction, correction_cache_exists = get_cached_correction(message_id)
+    fetched = prefetched is not None and message_id in prefetched
+    if fetched:
+        correction_cache_exists = False
+    else:
+        cached_correction, correction_cache_exists = get_cached_correction(message_id)
     if correction_cache_exists:
         if cached_correction is not None:
             # We have a cached AI correction - apply standardization to it
@@ -251,7 +418,15 @@ def process_record(record: Dict[str, Any], preview_mode: bool = False) -> Tuple[
     else:
         # No cache - get AI correction first, then standardize
         try:
-            ai_correction = correct_reflection_with_ai(original_reflection)
+            if fetched:
+                # Already requested (and cached, unless it failed) by prefetch_corrections
+                ai_correction = prefetched.pop(message_id)
+                if isinstance(ai_correction, Exception):
+                    raise ai_correction
+            else:
+                ai_correction = correct_reflection_with_ai(original_reflection)
+                # Cache the AI correction (before standardization), or that none was needed
+                save_correction(message_id, ai_correction)
             correction_cache_hit = False
 
             if ai_correction is not None:
@@ -259,8 +434,6 @@ def process_record(record: Dict[str, Any], preview_mode: bool = False) -> Tuple[
                 final_reflection = standardize_text_formatting(ai_correction)
                 needs_update = True
                 correction_source = 'NEW AI+QUOTES'
-                # Cache the AI correction (before standardization)
-                save_correction(message_id, ai_correction)
             else:
                 # AI made no corrections - just standardize original
                 standardized_reflection = standardize_text_formatting(original_reflection)
@@ -272,8 +445,6 @@ def process_record(record: Dict[str, Any], preview_mode: bool = False) -> Tuple[
                     final_reflection = original_reflection
                     needs_update = False
                     correction_source = 'NEW OK'
-                # Cache that no AI correction was needed
-                save_correction(message_id, None)
 
         except Exception as e:
             if preview_mode:
@@ -315,60 +486,84 @@ def process_record(record: Dict[str, Any], preview_mode: bool = False) -> Tuple[
         return record, False
 
 
-def load_json_file(file_path: str) -> List[Dict[str, Any]]:
-    """Load JSON file and return list of records."""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+def load_json_file(file_path: str) -> Tuple[List[Dict[str, Any]], bool]:
+    """Load JSON file and return (records, was_list)."""
+    if orjson:
+        with open(file_path, 'rb') as f:
+            data = orjson.loads(f.read())
+    else:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
 
     # Handle both single objects and arrays
     if isinstance(data, list):
-        return data
+        return data, True
     else:
-        return [data]
-
+        return [data], False
 
-def save_json_file(file_path: str, records: List[Dict[str, Any]]):
-    """Save records back to JSON file."""
-    # Determine if original was a single object or array
-    with open(file_path, 'r', encoding='utf-8') as f:
-        original_data = json.load(f)
 
-    if isinstance(original_data, list):
+def save_json_file(file_path: str, records: List[Dict[str, Any]], was_list: bool):
+    """Save records back to JSON file, keeping the original single-object or array shape."""
+    if was_list:
         data_to_save = records
     else:
         data_to_save = records[0] if records else {}
 
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(data_to_save, f, indent=2, ensure_ascii=False)
+    if orjson:
+        payload = orjson.dumps(data_to_save, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data_to_save, indent=2, ensure_ascii=False).encode('utf-8')
+    # Temp file + rename, so the target is never left half-written
+    write_bytes_atomic(file_path, payload)
 
 
-def rename_file_after_processing(original_path: str, preview_mode: bool) -> bool:
-    """Rename parsed_<nnnn>.json to <nnnn>.json after processing."""
+def preview_rename(original_path: str) -> bool:
+    """Report the parsed_<nnnn>.json to <nnnn>.json rename an update run would do."""
     new_path = get_renamed_filename(original_path)
     if new_path is None:
         return False
+    print(f'📝 Would rename: {os.path.basename(original_path)} → {os.path.basename(new_path)}')
+    return True
 
-    if preview_mode:
-        print(f'📝 Would rename: {os.path.basename(original_path)} → {os.path.basename(new_path)}')
-        return True
 
-    try:
-        if os.path.exists(new_path):
-            print(f'⚠️  Target file {new_path} already exists, skipping rename')
-            return False
+def save_and_rename(original_path: str, records: List[Dict[str, Any]], was_list: bool) -> bool:
+    """
+    Save the processed records in place, then rename parsed_<nnnn>.json to
+    <nnnn>.json with a single os.replace, so the records only ever exist under
+    one of the two names. Returns True if the file was renamed.
+    """
+    save_json_file(original_path, records, was_list)
+    new_path = get_renamed_filename(original_path)
+    if new_path is None:
+        return False
+    if os.path.exists(new_path):
+        print(f'⚠️  Target file {new_path} already exists, skipping rename')
+        return False
 
-        os.rename(original_path, new_path)
-        print(f'📝 Renamed: {os.path.basename(original_path)} → {os.path.basename(new_path)}')
-        return True
+    try:
+        os.replace(original_path, new_path)
     except Exception as e:
         print(f'❌ Error renaming {original_path}: {e}')
         return False
+    print(f'📝 Renamed: {os.path.basename(original_path)} → {os.path.basename(new_path)}')
+    return True
 
 
 def main():
     parser = argparse.ArgumentParser(description='Correct reflection fields in JSON files using Claude AI')
     parser.add_argument('files', nargs='+', help='JSON files to process')
     parser.add_argument('--preview', action='store_true', help='Preview changes without making them')
+    parser.add_argument(
+        '--batch',
+        action='store_true',
+        help='Send uncached reflections through the Message Batches API (cheaper, but may take a while)',
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f'Concurrent Claude API calls (default: {DEFAULT_WORKERS}; 1 makes them one at a time)',
+    )
 
     args = parser.parse_args()
 
@@ -386,6 +581,29 @@ def main():
     print(f'\n🔄 Processing {len(args.files)} file(s) in {"PREVIEW" if args.preview else "UPDATE"} mode...')
     print('📝 Applying: quote/space normalization + \\n removal + AI corrections')
 
+    # Read every file up front so all uncached reflections can go to Claude
+    # concurrently; unreadable files are reported in the loop below
+    loaded: Dict[str, Tuple[List[Dict[str, Any]], bool]] = {}
+    pending: Dict[str, str] = {}
+    for file_path in args.files:
+        if file_path in loaded or not os.path.exists(file_path):
+            continue
+        try:
+            loaded[file_path] = load_json_file(file_path)
+        except Exception:
+            continue
+        collect_uncached(loaded[file_path][0], pending)
+    if args.batch:
+        prefetched = prefetch_corrections_batch(pending)
+    else:
+        if pending:
+            distinct = len(set(pending.values()))
+            print(
+                f'🤖 Requesting {distinct} correction(s) for {len(pending)} message(s) from Claude '
+                f'({args.workers} at a time)...'
+            )
+        prefetched = prefetch_corrections(pending, args.workers)
+
     for file_path in args.files:
         if not os.path.exists(file_path):
             print(f'Warning: File {file_path} not found, skipping...')
@@ -396,7 +614,7 @@ def main():
             print(f'PROCESSING: {file_path}')
             print(f'{"=" * 70}')
 
-            records = load_json_file(file_path)
+            records, was_list = loaded.pop(file_path) if file_path in loaded else load_json_file(file_path)
             updated_records = []
             file_corrections = 0
 
@@ -404,19 +622,18 @@ def main():
                 if args.preview:
                     print(f'\n--- Record {i}/{len(records)} ---')
 
-                updated_record, was_corrected = process_record(record, args.preview)
+                updated_record, was_corrected = process_record(record, args.preview, prefetched)
                 updated_records.append(updated_record)
 
                 if was_corrected:
                     file_corrections += 1
                     total_corrected += 1
 
-            # Save the file (even if no corrections were made)
-            if not args.preview:
-                save_json_file(file_path, updated_records)
-
-            # Rename the file after processing
-            renamed = rename_file_after_processing(file_path, args.preview)
+            # Save the file (even if no corrections were made), renaming it in the same step
+            if args.preview:
+                renamed = preview_rename(file_path)
+            else:
+                renamed = save_and_rename(file_path, updated_records, was_list)
             if renamed:
                 total_renamed += 1
 
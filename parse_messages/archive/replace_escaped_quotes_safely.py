@@ -15,132 +15,136 @@ Usage:
 import argparse
 import os
 import re
-from typing import Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
 
 # Target fields
 TARGET_FIELDS = ('verse_text', 'prayer', 'reflection')
 LEFT_SMART_QUOTE = '“'
+# Files are processed as raw UTF-8 bytes: every byte the patterns look at is
+# ASCII, and ASCII bytes never occur inside a multi-byte UTF-8 sequence
+# An unescaped backslash run of odd length followed by a quote: group 1 holds the escaped backslashes
+ESCAPED_QUOTE_RE = re.compile(rb'(?<!\\)((?:\\\\)*)\\"')
+ESCAPED_QUOTE_REPL = rb'\1' + LEFT_SMART_QUOTE.encode('utf-8')
 
 
-# Regex that finds a JSON string field by name and captures the raw quoted value (with escapes)
+# Regex that finds a JSON string field by any of the given names and captures the raw quoted value (with escapes)
 # Key rules:
-#   - match JSON string key: "key"
+#   - match JSON string key: "key" (one alternation covers every field, so the file is scanned once)
 #   - optional whitespace, colon, optional whitespace
 #   - capture the value string as a JSON string starting with " and ending at the matching "
 #   - handle escaped quotes and backslashes within the value
 #
-# This pattern: ("key")\s*:\s*(" ... ")
+# This pattern: ("(key1|key2|...)")\s*:\s*(" ... ")
 # Where the value " ... " is matched by \" (escaped quote) or \\ (escaped backslash) or [^"\\] (any other char)
-def build_field_regex(field: str) -> re.Pattern:
-    key = re.escape(field)
-    pattern = rf'("{key}")\s*:\s*("(?:\\.|[^"\\])*")'
+def build_fields_regex(fields: Tuple[str, ...]) -> re.Pattern:
+    keys = b'|'.join(re.escape(field.encode('utf-8')) for field in fields)
+    pattern = rb'("(' + keys + rb')")\s*:\s*("(?:\\.|[^"\\])*")'
     return re.compile(pattern)
 
 
+FIELDS_RE = build_fields_regex(TARGET_FIELDS)
+
+
 # Replace only unescaped \" within a JSON-quoted string literal
-def replace_escaped_quotes_in_json_string_literal(literal: str) -> Tuple[str, int]:
+def replace_escaped_quotes_in_json_string_literal(literal: bytes) -> Tuple[bytes, int]:
     """
     literal: a JSON string literal including surrounding quotes, e.g. "some \"text\" here"
     Returns: (new_literal, replacements_count)
     Only replaces occurrences of backslash+quote inside the literal content.
     """
-    assert literal.startswith('"') and literal.endswith('"')
+    assert literal.startswith(b'"') and literal.endswith(b'"')
     inner = literal[1:-1]
 
-    # We want to replace occurrences of \" that are not themselves escaped (i.e., not \\\" as the backslash)
-    # But in JSON string content, a backslash is escaped as \\ in the raw file. Here we are still in the raw file context.
-    #
-    # Strategy: walk the string and when we see a backslash that escapes a quote, replace the pair \" with the UTF-8 smart quote,
-    # but we must encode the smart quote as-is (no backslash) inside the JSON string; JSON allows unicode chars directly.
-    #
-    # Careful with sequences like \\" (escaped backslash + quote). In raw text it's two chars backslash+backslash then quote.
-    # We only replace when the backslash directly escapes the quote (i.e., a single backslash before " that is not itself escaped).
-
-    chars = []
-    i = 0
-    replacements = 0
-    while i < len(inner):
-        c = inner[i]
-        if c == '\\':
-            # Count preceding consecutive backslashes including this one
-            # If we see a backslash and the next char is ", and the number of consecutive backslashes before the quote is odd,
-            # then this backslash escapes the quote.
-            j = i
-            while j < len(inner) and inner[j] == '\\':
-                j += 1
-            backslashes_count = j - i
-            next_char = inner[j] if j < len(inner) else ''
-            if next_char == '"' and backslashes_count % 2 == 1:
-                # Replace the pair (a single escaping backslash + ") with the smart quote,
-                # and keep any additional preceding backslashes beyond the escaping one.
-                # E.g., for "\\\"" (two backslashes + quote), the sequence represents: escaped backslash + escaped quote.
-                # Backslashes_count may be 1,3,5,... If it's 1, we replace \" with “
-                # If it's 3, it's \\\" where two backslashes produce a literal \ and one escapes the quote.
-                # We keep backslashes_count - 1 literal backslashes, then emit the smart quote.
-                literal_bslashes_to_keep = backslashes_count - 1
-                chars.extend('\\' * literal_bslashes_to_keep)
-                chars.append(LEFT_SMART_QUOTE)
-                replacements += 1
-                i = j + 1  # skip the quote too
-                continue
-            else:
-                # Not an escaping backslash for a quote; copy the backslashes
-                chars.extend('\\' * backslashes_count)
-                i = j
-                continue
-        # Normal char path
-        chars.append(c)
-        i += 1
-
-    new_inner = ''.join(chars)
-    return f'"{new_inner}"', replacements
-
-
-def process_file(path: str, preview: bool) -> int:
-    with open(path, 'r', encoding='utf-8') as f:
+    # A quote is escaped when an odd run of backslashes precedes it: keep the
+    # even part (escaped backslashes) and replace the final \" with the smart quote.
+    # The C regex engine does the run counting the old per-character loop did.
+    new_inner, replacements = ESCAPED_QUOTE_RE.subn(ESCAPED_QUOTE_REPL, inner)
+    return b'"' + new_inner + b'"', replacements
+
+
+def process_file(path: str, preview: bool) -> Tuple[int, List[str]]:
+    """
+    Replace the escaped quotes in one file. Returns the replacement count and
+    the preview report lines (empty outside preview mode).
+    """
+    with open(path, 'rb') as f:
         raw = f.read()
 
     total_changes = 0
     any_header_printed = False
-
-    # For each target field, apply replacements on its value string(s)
-    for field in TARGET_FIELDS:
-        pattern = build_field_regex(field)
-
-        # We will rebuild the file with re.sub using a function that transforms only the value literal
-        def repl(m: re.Match) -> str:
-            nonlocal total_changes, any_header_printed
-            key = m.group(1)  # "field"
-            value_lit = m.group(2)  # "...." (raw JSON string with escapes)
-
-            new_value_lit, count = replace_escaped_quotes_in_json_string_literal(value_lit)
-            if count > 0:
-                total_changes += count
-                if preview and not any_header_printed:
-                    print('\n' + '=' * 70)
-                    print(f'FILE: {path}')
-                    print('=' * 70)
-                    any_header_printed = True
-                if preview:
-                    # Print a short diff-like view
-                    before_snip = value_lit[:80].replace('\n', ' ')
-                    after_snip = new_value_lit[:80].replace('\n', ' ')
-                    suffix_b = '…' if len(value_lit) > 80 else ''
-                    suffix_a = '…' if len(new_value_lit) > 80 else ''
-                    print(f'* {field}:')
-                    print(f'    BEFORE: {before_snip}{suffix_b}')
-                    print(f'    AFTER : {after_snip}{suffix_a}')
-                return f'{key}: {new_value_lit}'
-            else:
-                return m.group(0)
-
-        raw = pattern.sub(repl, raw)
+    lines: List[str] = []
+
+    # Rebuild the file in one re.sub pass over all target fields (in document order),
+    # using a function that transforms only the value literal
+    def repl(m: re.Match) -> bytes:
+        nonlocal total_changes, any_header_printed
+        key = m.group(1)  # "field"
+        field = m.group(2).decode('utf-8')
+        value_lit = m.group(3)  # "...." (raw JSON string with escapes)
+
+        new_value_lit, count = replace_escaped_quotes_in_json_string_literal(value_lit)
+        if count > 0:
+            total_changes += count
+            if preview and not any_header_printed:
+                lines.extend(('\n' + '=' * 70, f'FILE: {path}', '=' * 70))
+                any_header_printed = True
+            if preview:
+                # Print a short diff-like view (snippets are cut by characters, not bytes)
+                before = value_lit.decode('utf-8', 'replace')
+                after = new_value_lit.decode('utf-8', 'replace')
+                before_snip = before[:80].replace('\n', ' ')
+                after_snip = after[:80].replace('\n', ' ')
+                suffix_b = '…' if len(before) > 80 else ''
+                suffix_a = '…' if len(after) > 80 else ''
+                lines.extend(
+                    (
+                        f'* {field}:',
+                        f'    BEFORE: {before_snip}{suffix_b}',
+                        f'    AFTER : {after_snip}{suffix_a}',
+                    )
+                )
+            return key + b': ' + new_value_lit
+        else:
+            return m.group(0)
+
+    raw = FIELDS_RE.sub(repl, raw)
 
     if total_changes > 0 and not preview:
-        with open(path, 'w', encoding='utf-8') as f:
+        with open(path, 'wb') as f:
             f.write(raw)
 
-    return total_changes
+    return total_changes, lines
+
+
+def process_path(path: str, preview: bool) -> Tuple[Optional[int], str]:
+    """
+    process_file plus its report. Returns (replacement count, report text);
+    the count is None when the file is missing or could not be processed.
+    """
+    if not os.path.exists(path):
+        return None, f'Warning: not found: {path}'
+    try:
+        changes, lines = process_file(path, preview)
+    except Exception as e:
+        return None, f'❌ Error processing {path}: {e}'
+    if not preview and changes > 0:
+        lines.append(f'✔ Updated {path} ({changes} replacement(s))')
+    return changes, '\n'.join(lines)
+
+
+def process_paths(paths: List[str], preview: bool, workers: int):
+    """
+    Yield process_path results in path order, using a process pool when
+    there is more than one file and more than one worker.
+    """
+    if workers <= 1 or len(paths) < 2:
+        for path in paths:
+            yield process_path(path, preview)
+        return
+    n = len(paths)
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        yield from ex.map(process_path, paths, [preview] * n, chunksize=4)
 
 
 def main():
@@ -151,23 +155,24 @@ def main():
         help='Show only what would change; do not write files',
     )
     ap.add_argument('files', nargs='+', help='JSON files to process (e.g., *.json)')
+    ap.add_argument(
+        '--workers',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Worker processes (default: CPU count; 1 disables the pool)',
+    )
     args = ap.parse_args()
 
     total_files = 0
     total_changes = 0
 
-    for path in args.files:
-        if not os.path.exists(path):
-            print(f'Warning: not found: {path}')
+    for changes, report in process_paths(args.files, args.preview, args.workers):
+        if report:
+            print(report)
+        if changes is None:
             continue
-        try:
-            changes = process_file(path, args.preview)
-            if not args.preview and changes > 0:
-                print(f'✔ Updated {path} ({changes} replacement(s))')
-            total_changes += changes
-            total_files += 1
-        except Exception as e:
-            print(f'❌ Error processing {path}: {e}')
+        total_changes += changes
+        total_files += 1
 
     print('\n' + '=' * 70)
     print('SUMMARY')
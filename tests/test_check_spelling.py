@@ -0,0 +1,21 @@
+import check_spelling as cs
+
+UNBALANCED = 'Teh start (Teh aside (Teh) more Teh'
+
+
+def test_split_paren_segments_nested_and_unbalanced():
+    assert cs.split_paren_segments('x (a (b) c) y') == [(False, 'x '), (True, '(a (b) c)'), (False, ' y')]
+    assert cs.split_paren_segments('a) b (c') == [(False, 'a) b (c')]
+    assert cs.split_paren_segments(UNBALANCED) == [
+        (False, 'Teh start (Teh aside '),
+        (True, '(Teh)'),
+        (False, ' more Teh'),
+    ]
+
+
+def test_outside_fix_skips_pair_after_unmatched_paren():
+    replace_everywhere, replace_outside_parens = cs.build_replacers('Teh', 'The')
+    # The scan never sees the balanced pair, so the outside-only fix must not touch it either
+    assert cs.remove_parentheticals(UNBALANCED) == 'Teh start (Teh aside  more Teh'
+    assert replace_outside_parens(UNBALANCED) == ('The start (The aside (Teh) more The', 3)
+    assert replace_everywhere(UNBALANCED) == ('The start (The aside (The) more The', 4)
@@ -0,0 +1,37 @@
+import interactive_replace_ps as irp
+
+CONTENT = """[
+  {
+    "meta": {"subject": "nested", "inner": [{"subject": "deeper"}]},
+    "subject": "Ps 23"
+  },
+  {
+    "subject": "Ro 8",
+    "verse": "\\"subject\\": not a key"
+  },
+  {"verse": "Heb 11"}
+]
+"""
+
+
+def test_key_line_uses_each_records_own_key(tmp_path):
+    path = tmp_path / 'a.json'
+    path.write_text(CONTENT, encoding='utf-8')
+    data, content, spans = irp.read_json_file(str(path))
+    assert len(data) == len(spans) == 3
+    lines = [irp.key_line(content, start, 'subject') for start, _ in spans]
+    assert lines == [4, 7, 1]
+    assert irp.key_line(content, spans[1][0], 'verse') == 8
+
+
+def test_interactive_reports_record_lines(tmp_path, monkeypatch, capsys):
+    path = tmp_path / 'a.json'
+    path.write_text(CONTENT, encoding='utf-8')
+    monkeypatch.setattr('builtins.input', lambda _: 'n')
+    assert irp.process_file(str(path), 'interactive', ['subject', 'verse']) == (0, 0)
+    out = capsys.readouterr().out
+    assert [line for line in out.splitlines() if line.startswith('file  :')] == [
+        'file  : a.json:4',
+        'file  : a.json:7',
+        'file  : a.json:10',
+    ]
@@ -0,0 +1,46 @@
+import os
+import shutil
+
+import replace_escaped_quotes_safely as req
+
+FILES = {
+    'a.json': '[{"reflection": "He said \\"go\\"", "verse": "John 3:16"}]\n',
+    'b.json': '[{"prayer": "no quotes here"}]\n',
+    'c.json': '{"verse_text": "\\\\\\"odd\\" and \\\\\\\\\\"", "prayer": "“ok\\""}\n',
+    'd.json': '[{"subject": "\\"untouched\\""}]\n',
+    'e.json': '[{"reflection": "a \\"b\\" c", "prayer": "\\"x\\""}, {"reflection": "\\"y"}]\n',
+}
+
+
+def run(tmp_path, name, preview, workers):
+    base = tmp_path / name
+    base.mkdir()
+    paths = []
+    for fname, content in FILES.items():
+        (base / fname).write_text(content, encoding='utf-8')
+        paths.append(fname)
+    paths.append('missing.json')
+    cwd = os.getcwd()
+    os.chdir(base)
+    try:
+        results = list(req.process_paths(paths, preview, workers))
+    finally:
+        os.chdir(cwd)
+    contents = {fname: (base / fname).read_bytes() for fname in FILES}
+    shutil.rmtree(base)
+    return results, contents
+
+
+def test_pool_matches_serial(tmp_path):
+    for preview in (True, False):
+        serial = run(tmp_path, 'serial', preview, 1)
+        pooled = run(tmp_path, 'pooled', preview, 2)
+        assert pooled == serial
+
+
+def test_serial_replaces_only_target_fields(tmp_path):
+    results, contents = run(tmp_path, 'update', False, 1)
+    assert [changes for changes, _ in results] == [2, 0, 4, 0, 5, None]
+    assert contents['a.json'] == '[{"reflection": "He said “go“", "verse": "John 3:16"}]\n'.encode()
+    assert contents['d.json'] == FILES['d.json'].encode()
+    assert results[-1] == (None, 'Warning: not found: missing.json')